@@ -3,53 +3,74 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
+from app.utils.cache import CatalogCache
+from app.utils.compression import Compressor
+from app.utils.instrumentation import SQLInstrumentation
+from app.utils.json_provider import FastJSONProvider
+from app.utils.passwords import PasswordHasher
+from app.utils.pool_metrics import PoolMonitor
+from app.utils.ratelimit import RateLimiter
 import os
 import sys
 
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-db = SQLAlchemy()
+# Written objects are serialized from memory after commit, not reloaded
+db = SQLAlchemy(session_options={'expire_on_commit': False})
 migrate = Migrate()
 jwt = JWTManager()
 cors = CORS()
+catalog_cache = CatalogCache()
+password_hasher = PasswordHasher()
+limiter = RateLimiter()
+sql_instrumentation = SQLInstrumentation()
+compressor = Compressor()
+pool_monitor = PoolMonitor()
 
 def create_app(config_class=None):
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     
-    # Load configuration
+    # Load configuration: APP_ENV picks a class from instance/config.py,
+    # otherwise a top-level config module, otherwise the shared defaults
     if config_class is None:
-        try:
-            from config import Config
-            config_class = Config
-        except ImportError:
-            # Fallback configuration
-            class Config:
-                SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
-                SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///ecommerce.db'
-                SQLALCHEMY_TRACK_MODIFICATIONS = False
-                JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-change-in-production'
-                JWT_ACCESS_TOKEN_EXPIRES = 3600  # 1 hour in seconds
-            
-            config_class = Config
+        from instance.config import get_config
+        env = os.environ.get('APP_ENV')
+        if env:
+            config_class = get_config(env)
+        else:
+            try:
+                from config import Config
+                config_class = Config
+            except ImportError:
+                config_class = get_config()
         
     app.config.from_object(config_class)
 
-    # Initialize extensions
+    # Initialize extensions (pool_monitor sets engine options, so before db)
+    pool_monitor.init_app(app, db)
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
     cors.init_app(app)
+    sql_instrumentation.init_app(app, db)
+    catalog_cache.init_app(app)
+    password_hasher.init_app(app)
+    limiter.init_app(app)
+    compressor.init_app(app)
 
     # Register blueprints
     from app.routes.user import user_bp
     from app.routes.product import product_bp
     from app.routes.cart import cart_bp
     from app.routes.order import order_bp
+    from app.routes.admin import admin_bp
 
     app.register_blueprint(user_bp, url_prefix='/api/auth')
     app.register_blueprint(product_bp, url_prefix='/api')
     app.register_blueprint(cart_bp, url_prefix='/api')
     app.register_blueprint(order_bp, url_prefix='/api')
+    app.register_blueprint(admin_bp, url_prefix='/api/admin')
 
     return app
\ No newline at end of file
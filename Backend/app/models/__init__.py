@@ -2,4 +2,7 @@
 from app.models.user import User
 from app.models.product import Product
 from app.models.cart import Cart, CartItem
-from app.models.order import Order, OrderItem
\ No newline at end of file
+from app.models.order import Order, OrderItem
+from app.models.stats import DailyOrderStat, DailyUserStat, StatTotal
+from app.models.idempotency import IdempotencyKey
+from app.models.catalog import CatalogVersion
\ No newline at end of file
@@ -1,21 +1,100 @@
+from sqlalchemy import literal, select, update
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 from app import db
+from app.utils.upsert import dialect_insert
 
 class Cart(db.Model):
+    # Fetch server-generated timestamps in the INSERT/UPDATE itself
+    __mapper_args__ = {'eager_defaults': True}
+
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, unique=True, index=True)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
     updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), 
                           onupdate=db.func.current_timestamp())
+    # Incremented by every mutation, so clients can apply deltas in order
+    version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Relationships
     items = db.relationship('CartItem', backref='cart', lazy=True, cascade='all, delete-orphan')
 
+    @classmethod
+    def for_user(cls, user_id):
+        """Load a user's cart with its items and their products in one query"""
+        return cls.query.options(
+            joinedload(cls.items).joinedload(CartItem.product)
+        ).filter_by(user_id=user_id).first()
+
+    @classmethod
+    def ensure_for_user(cls, user_id):
+        """Create the user's cart if it does not exist yet and return its id.
+
+        Carts are created on first write only; the upsert on the unique
+        ``user_id`` makes concurrent first writes safe.
+        """
+        db.session.execute(
+            dialect_insert(cls).values(user_id=user_id)
+            .on_conflict_do_nothing(index_elements=['user_id'])
+        )
+        return db.session.query(cls.id).filter_by(user_id=user_id).scalar()
+
+    @classmethod
+    def add_item(cls, user_id, product_id, quantity):
+        """Add ``quantity`` of a product to the user's existing cart in one statement.
+
+        Inserts the line, or adds to its quantity if the product is already in
+        the cart. The insert selects from ``product`` so nothing is written
+        when the product is missing or short on stock. Returns the line's id,
+        or None when no row was written: no cart yet, unknown product, or
+        insufficient stock.
+        """
+        from app.models.product import Product
+
+        source = select(cls.id, Product.id, literal(quantity, db.Integer)) \
+            .join(Product, Product.id == product_id) \
+            .where(cls.user_id == user_id, Product.stock >= quantity)
+        stmt = dialect_insert(CartItem).from_select(['cart_id', 'product_id', 'quantity'], source)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['cart_id', 'product_id'],
+            set_={'quantity': CartItem.quantity + stmt.excluded.quantity}
+        )
+        return db.session.execute(stmt.returning(CartItem.id)).scalar()
+
+    @classmethod
+    def bump_version(cls, user_id):
+        """Increment the user's cart version; return ``(cart_id, version)``"""
+        stmt = update(cls).where(cls.user_id == user_id) \
+            .values(version=cls.version + 1) \
+            .returning(cls.id, cls.version) \
+            .execution_options(synchronize_session=False)
+        row = db.session.execute(stmt).one_or_none()
+        
+        # Keep a cart loaded in this session in step with the row
+        cart = db.session.identity_map.get(identity_key(cls, row.id)) if row else None
+        if cart is not None:
+            set_committed_value(cart, 'version', row.version)
+            db.session.expire(cart, ['updated_at'])
+        return row
+
+    def find_item(self, item_id=None, product_id=None):
+        """Find a loaded cart item by id or by product without querying"""
+        for item in self.items:
+            if item_id is not None and item.id == item_id:
+                return item
+            if product_id is not None and item.product_id == product_id:
+                return item
+        return None
+
     def to_dict(self):
+        items = [item.to_dict() for item in self.items]
         return {
             'id': self.id,
             'user_id': self.user_id,
-            'items': [item.to_dict() for item in self.items],
-            'total': sum(item.subtotal for item in self.items)
+            'version': self.version or 0,
+            'items': items,
+            'total': sum(item['subtotal'] for item in items)
         }
 
 class CartItem(db.Model):
@@ -23,6 +102,11 @@ class CartItem(db.Model):
     cart_id = db.Column(db.Integer, db.ForeignKey('cart.id'), nullable=False)
     product_id = db.Column(db.Integer, db.ForeignKey('product.id'), nullable=False)
     quantity = db.Column(db.Integer, nullable=False, default=1)
+
+    __table_args__ = (
+        # One line per product; adding an existing product bumps its quantity
+        db.Index('ix_cart_item_cart_id_product_id', 'cart_id', 'product_id', unique=True),
+    )
     
     @property
     def subtotal(self):
@@ -0,0 +1,15 @@
+from app import db
+
+class CatalogVersion(db.Model):
+    """Single-row counter bumped by every catalog write.
+
+    Shared by all workers, so each can tell when its cached catalog reads
+    are out of date (see ``app.utils.cache.DatabaseVersion``).
+    ``updated_at`` is when it was last bumped, which is the Last-Modified
+    time of every catalog read.
+    """
+    __tablename__ = 'catalog_version'
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime)
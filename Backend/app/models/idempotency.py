@@ -0,0 +1,20 @@
+from app import db
+
+class IdempotencyKey(db.Model):
+    """A client-supplied key for a POST, with the response it produced.
+
+    ``status_code`` is NULL while the first request is still running.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    key = db.Column(db.String(255), nullable=False)
+    request_hash = db.Column(db.String(64), nullable=False)
+    status_code = db.Column(db.Integer)
+    response_body = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp(), nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'key', name='uq_idempotency_key_user_id_key'),
+        # Expired keys are purged by age
+        db.Index('ix_idempotency_key_created_at', 'created_at'),
+    )
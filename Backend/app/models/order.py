@@ -1,6 +1,15 @@
 from app import db
 
 class Order(db.Model):
+    __table_args__ = (
+        # Order listings page on (created_at, id), newest first, per user or status
+        db.Index('ix_order_created_at_id', 'created_at', 'id'),
+        db.Index('ix_order_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+        db.Index('ix_order_status_created_at_id', 'status', 'created_at', 'id'),
+    )
+    # Fetch server-generated timestamps in the INSERT/UPDATE itself
+    __mapper_args__ = {'eager_defaults': True}
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     total_amount = db.Column(db.Float, nullable=False)
@@ -31,7 +40,7 @@ class Order(db.Model):
 
 class OrderItem(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey('order.id'), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey('order.id'), nullable=False, index=True)
     product_id = db.Column(db.Integer, db.ForeignKey('product.id'), nullable=False)
     quantity = db.Column(db.Integer, nullable=False)
     price = db.Column(db.Float, nullable=False)  # Price at time of order
@@ -1,6 +1,15 @@
 from app import db
 
 class Product(db.Model):
+    __table_args__ = (
+        # Keyset pagination seeks on (sort key, id); category filters sort by price
+        db.Index('ix_product_name_id', 'name', 'id'),
+        db.Index('ix_product_price_id', 'price', 'id'),
+        db.Index('ix_product_category_price_id', 'category', 'price', 'id'),
+    )
+    # Fetch server-generated timestamps in the INSERT/UPDATE itself
+    __mapper_args__ = {'eager_defaults': True}
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
@@ -9,6 +18,8 @@ class Product(db.Model):
     image_url = db.Column(db.String(200))
     category = db.Column(db.String(50))
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), 
+                          onupdate=db.func.current_timestamp())
     
     # Relationships
     cart_items = db.relationship('CartItem', backref='product', lazy=True)
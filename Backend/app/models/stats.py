@@ -0,0 +1,32 @@
+from app import db
+
+class DailyOrderStat(db.Model):
+    """Per-day, per-status order rollup, maintained as orders change"""
+    day = db.Column(db.Date, primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            'day': self.day.isoformat(),
+            'status': self.status,
+            'order_count': self.order_count,
+            'revenue': self.revenue
+        }
+
+class DailyUserStat(db.Model):
+    """Per-day count of new sign-ups"""
+    day = db.Column(db.Date, primary_key=True)
+    new_users = db.Column(db.Integer, nullable=False, default=0)
+
+class StatTotal(db.Model):
+    """Running all-time totals, maintained alongside the daily rollups.
+
+    One row per counter: ``orders:<status>`` (order count and revenue per
+    status), ``users`` and ``products``; reading them all costs the same
+    however much history there is.
+    """
+    name = db.Column(db.String(40), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    amount = db.Column(db.Float, nullable=False, default=0)
@@ -1,4 +1,5 @@
 from app.routes.user import user_bp
 from app.routes.product import product_bp
 from app.routes.cart import cart_bp
-from app.routes.order import order_bp
\ No newline at end of file
+from app.routes.order import order_bp
+from app.routes.admin import admin_bp
\ No newline at end of file
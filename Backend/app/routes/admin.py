@@ -0,0 +1,48 @@
+from datetime import timedelta
+from flask import Blueprint, request, jsonify
+from app import pool_monitor
+from app.models.stats import DailyOrderStat, DailyUserStat, StatTotal
+from app.utils.auth import admin_required
+from app.utils.instrumentation import query_budget
+from app.utils.rollups import today
+
+admin_bp = Blueprint('admin', __name__)
+
+MAX_STATS_DAYS = 366
+
+@admin_bp.route('/stats', methods=['GET'])
+@query_budget(3)
+@admin_required()
+def get_stats():
+    days = max(1, min(request.args.get('days', 30, type=int), MAX_STATS_DAYS))
+    since = today() - timedelta(days=days - 1)
+    
+    # Totals come from running counters, never from scanning order, user,
+    # product or the whole rollup history
+    totals = {total.name: total for total in StatTotal.query.all()}
+    by_status = {name.split(':', 1)[1]: total for name, total in totals.items()
+                 if name.startswith('orders:')}
+    
+    daily = {}
+    for stat in DailyOrderStat.query.filter(DailyOrderStat.day >= since).all():
+        entry = daily.setdefault(stat.day, {'orders': 0, 'revenue': 0.0, 'new_users': 0})
+        entry['orders'] += stat.order_count
+        if stat.status != 'cancelled':
+            entry['revenue'] += stat.revenue
+    for stat in DailyUserStat.query.filter(DailyUserStat.day >= since).all():
+        daily.setdefault(stat.day, {'orders': 0, 'revenue': 0.0, 'new_users': 0})['new_users'] = stat.new_users
+    
+    return jsonify({
+        'total_orders': sum(total.count for total in by_status.values()),
+        'total_revenue': round(sum(total.amount for status, total in by_status.items() if status != 'cancelled'), 2),
+        'total_customers': totals['users'].count if 'users' in totals else 0,
+        'total_products': totals['products'].count if 'products' in totals else 0,
+        'orders_by_status': {status: total.count for status, total in by_status.items()},
+        'daily': [dict(date=day.isoformat(), **daily[day]) for day in sorted(daily)]
+    }), 200
+
+@admin_bp.route('/db/pool', methods=['GET'])
+@admin_required()
+def get_pool_stats():
+    """Connection pool checkout metrics for the worker serving this request"""
+    return jsonify(pool_monitor.stats()), 200
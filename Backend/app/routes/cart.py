@@ -1,100 +1,158 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, abort
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.cart import Cart, CartItem
 from app.models.product import Product
-from app.models.user import User
+from app.schemas.cart_schema import cart_patch_schema
+from app.utils.carts import UnknownProduct, apply_operations, cart_delta
+from app.utils.instrumentation import query_budget
+from app.utils.inventory import InsufficientStock
 
 cart_bp = Blueprint('cart', __name__)
 
+def _get_cart_or_404(user_id):
+    cart = Cart.for_user(user_id)
+    if not cart:
+        abort(404)
+    return cart
+
+def _wants_delta():
+    return request.args.get('response') == 'delta' or \
+        'return=minimal' in request.headers.get('Prefer', '')
+
+def _commit_and_respond(user_id, cart=None, changed_ids=(), removed_ids=()):
+    """Bump the cart version, commit, and return the full cart or a delta.
+
+    A ``cart`` whose items were changed through the ORM is serialized from
+    memory; otherwise the cart is reloaded.
+    """
+    cart_id, version = Cart.bump_version(user_id)
+    db.session.commit()
+    
+    if not _wants_delta():
+        if cart is None:
+            cart = Cart.for_user(user_id)
+        return jsonify(cart.to_dict()), 200
+    
+    response = jsonify(cart_delta(cart_id, version, changed_ids, removed_ids))
+    if 'return=minimal' in request.headers.get('Prefer', ''):
+        response.headers['Preference-Applied'] = 'return=minimal'
+    return response, 200
+
 @cart_bp.route('/cart', methods=['GET'])
+@query_budget(1)
 @jwt_required()
 def get_cart():
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    cart = Cart.for_user(user_id)
     
-    if not user.cart:
+    # Carts are created on first write; until then serve an unsaved empty one
+    if not cart:
         cart = Cart(user_id=user_id)
-        db.session.add(cart)
-        db.session.commit()
     
-    return jsonify(user.cart.to_dict()), 200
+    return jsonify(cart.to_dict()), 200
 
 @cart_bp.route('/cart', methods=['POST'])
 @jwt_required()
 def add_to_cart():
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
     data = request.get_json()
     
     product_id = data.get('product_id')
     quantity = data.get('quantity', 1)
     
-    product = Product.query.get_or_404(product_id)
+    # Insert or bump the line in one statement
+    item_id = Cart.add_item(user_id, product_id, quantity)
+    
+    # Carts are created on first write; retry once if that is what was missing
+    if item_id is None and db.session.query(Cart.id).filter_by(user_id=user_id).scalar() is None:
+        Cart.ensure_for_user(user_id)
+        item_id = Cart.add_item(user_id, product_id, quantity)
     
-    if product.stock < quantity:
+    if item_id is None:
+        db.session.rollback()
+        Product.query.get_or_404(product_id)
         return jsonify({'message': 'Insufficient stock'}), 400
     
-    # Get or create cart
-    if not user.cart:
-        cart = Cart(user_id=user_id)
-        db.session.add(cart)
-        db.session.commit()
+    return _commit_and_respond(user_id, changed_ids=[item_id])
+
+@cart_bp.route('/cart', methods=['PATCH'])
+@jwt_required()
+def patch_cart():
+    """Apply a batch of add/set/remove operations in one transaction"""
+    user_id = get_jwt_identity()
     
-    cart = user.cart
+    errors = cart_patch_schema.validate(request.json or {})
+    if errors:
+        return jsonify({'errors': errors}), 400
     
-    # Check if item already in cart
-    cart_item = CartItem.query.filter_by(cart_id=cart.id, product_id=product_id).first()
+    data = cart_patch_schema.load(request.json)
     
-    if cart_item:
-        cart_item.quantity += quantity
-    else:
-        cart_item = CartItem(cart_id=cart.id, product_id=product_id, quantity=quantity)
-        db.session.add(cart_item)
+    cart = Cart.for_user(user_id)
+    if not cart:
+        Cart.ensure_for_user(user_id)
+        cart = Cart.for_user(user_id)
     
-    db.session.commit()
-    return jsonify(cart.to_dict()), 200
+    try:
+        changed_ids, removed_ids = apply_operations(cart, data['operations'])
+    except UnknownProduct as e:
+        db.session.rollback()
+        return jsonify({'message': f'Product {e.args[0]} not found'}), 404
+    except InsufficientStock as e:
+        db.session.rollback()
+        return jsonify({'message': str(e)}), 400
+    
+    return _commit_and_respond(user_id, cart, changed_ids, removed_ids)
 
 @cart_bp.route('/cart/<int:item_id>', methods=['PUT'])
 @jwt_required()
 def update_cart_item(item_id):
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
     data = request.get_json()
     
     quantity = data.get('quantity')
     
-    cart_item = CartItem.query.filter_by(id=item_id, cart_id=user.cart.id).first_or_404()
+    cart = _get_cart_or_404(user_id)
+    cart_item = cart.find_item(item_id=item_id)
+    if not cart_item:
+        abort(404)
     
     if quantity <= 0:
-        db.session.delete(cart_item)
-    else:
-        if cart_item.product.stock < quantity:
-            return jsonify({'message': 'Insufficient stock'}), 400
-        cart_item.quantity = quantity
+        cart.items.remove(cart_item)
+        return _commit_and_respond(user_id, cart, removed_ids=[item_id])
     
-    db.session.commit()
-    return jsonify(user.cart.to_dict()), 200
+    if cart_item.product.stock < quantity:
+        return jsonify({'message': 'Insufficient stock'}), 400
+    cart_item.quantity = quantity
+    
+    return _commit_and_respond(user_id, cart, changed_ids=[item_id])
 
 @cart_bp.route('/cart/<int:item_id>', methods=['DELETE'])
 @jwt_required()
 def remove_from_cart(item_id):
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
     
-    cart_item = CartItem.query.filter_by(id=item_id, cart_id=user.cart.id).first_or_404()
-    db.session.delete(cart_item)
-    db.session.commit()
+    cart = _get_cart_or_404(user_id)
+    cart_item = cart.find_item(item_id=item_id)
+    if not cart_item:
+        abort(404)
     
-    return jsonify(user.cart.to_dict()), 200
+    cart.items.remove(cart_item)
+    
+    return _commit_and_respond(user_id, cart, removed_ids=[item_id])
 
 @cart_bp.route('/cart/clear', methods=['DELETE'])
 @jwt_required()
 def clear_cart():
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    cart_id = db.session.query(Cart.id).filter_by(user_id=user_id).scalar()
+    
+    # No cart yet means there is nothing to clear
+    if cart_id is None:
+        return jsonify({'message': 'Cart cleared successfully', 'version': 0}), 200
     
-    CartItem.query.filter_by(cart_id=user.cart.id).delete()
+    CartItem.query.filter_by(cart_id=cart_id).delete()
+    _, version = Cart.bump_version(user_id)
     db.session.commit()
     
-    return jsonify({'message': 'Cart cleared successfully'}), 200
\ No newline at end of file
+    return jsonify({'message': 'Cart cleared successfully', 'version': version}), 200
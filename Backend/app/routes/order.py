@@ -1,47 +1,89 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db
+from sqlalchemy.orm import selectinload
+from app import db, catalog_cache
 from app.models.order import Order, OrderItem
 from app.models.cart import Cart, CartItem
-from app.models.user import User
-from app.models.product import Product
-from app.schemas.order_schema import order_schema, orders_schema, create_order_schema, update_order_schema
+from app.schemas.order_schema import dump_order, dump_orders, create_order_schema, update_order_schema
+from app.utils.auth import current_principal
+from app.utils.idempotency import idempotent
+from app.utils.instrumentation import query_budget
+from app.utils.inventory import InsufficientStock, find_shortage, release_stock, reserve_stock
+from app.utils.orders import InvalidOrderQuery, build_order_query, summary_query, summary_to_dict
+from app.utils.pagination import InvalidCursor, paginate_keyset, parse_limit
+from app.utils.rollups import record_order_created, record_status_change
 
 order_bp = Blueprint('order', __name__)
 
+ORDER_VIEWS = ('full', 'summary')
+
+def _get_order_or_404(order_id):
+    """Load an order with its items and their products up front"""
+    return Order.query.options(
+        selectinload(Order.items).joinedload(OrderItem.product)
+    ).get_or_404(order_id)
+
+def _order_page(query):
+    """Serialize one keyset page of orders, newest first"""
+    view = request.args.get('view', 'full')
+    if view not in ORDER_VIEWS:
+        raise InvalidOrderQuery(f"Invalid view. Choose from: {', '.join(ORDER_VIEWS)}")
+    
+    if view == 'summary':
+        query = summary_query(query)
+    else:
+        query = query.options(selectinload(Order.items).joinedload(OrderItem.product))
+    
+    limit = parse_limit(request.args.get('limit', type=int))
+    orders, next_cursor = paginate_keyset(
+        query, Order.created_at, Order.id, limit,
+        after=request.args.get('after'), descending=True
+    )
+    
+    if view == 'summary':
+        return {'orders': [summary_to_dict(row) for row in orders], 'next_cursor': next_cursor}
+    return {'orders': dump_orders(orders), 'next_cursor': next_cursor}
+
 @order_bp.route('/orders', methods=['GET'])
+@query_budget(2)
 @jwt_required()
 def get_orders():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    principal = current_principal()
+    user_id = principal.id
     
     # Admin can see all orders, regular users only their own
-    if user.is_admin:
-        orders = Order.query.order_by(Order.created_at.desc()).all()
-    else:
-        orders = Order.query.filter_by(user_id=user_id).order_by(Order.created_at.desc()).all()
+    try:
+        query = build_order_query(request.args, user_id, principal.is_admin)
+        page = _order_page(query)
+    except PermissionError:
+        return jsonify({'message': 'Access denied'}), 403
+    except InvalidOrderQuery as e:
+        return jsonify({'message': str(e)}), 400
+    except InvalidCursor:
+        return jsonify({'message': 'Invalid cursor'}), 400
     
-    return jsonify(orders_schema.dump(orders)), 200
+    return jsonify(page), 200
 
 @order_bp.route('/orders/<int:order_id>', methods=['GET'])
+@query_budget(2)
 @jwt_required()
 def get_order(order_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    principal = current_principal()
+    user_id = principal.id
     
-    order = Order.query.get_or_404(order_id)
+    order = _get_order_or_404(order_id)
     
     # Check if user owns the order or is admin
-    if order.user_id != user_id and not user.is_admin:
+    if order.user_id != user_id and not principal.is_admin:
         return jsonify({'message': 'Access denied'}), 403
     
-    return jsonify(order_schema.dump(order)), 200
+    return jsonify(dump_order(order)), 200
 
 @order_bp.route('/orders', methods=['POST'])
 @jwt_required()
+@idempotent
 def create_order():
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
     
     # Validate input data
     errors = create_order_schema.validate(request.json)
@@ -50,69 +92,68 @@ def create_order():
     
     data = create_order_schema.load(request.json)
     
-    if not user.cart or not user.cart.items:
+    cart = Cart.for_user(user_id)
+    if not cart or not cart.items:
         return jsonify({'message': 'Cart is empty'}), 400
     
-    # Check stock availability and prepare order items
+    # Prepare order items at current prices
     order_items = []
+    quantities = {}
     total_amount = 0
     
-    for cart_item in user.cart.items:
-        if cart_item.product.stock < cart_item.quantity:
-            return jsonify({
-                'message': f'Insufficient stock for {cart_item.product.name}. Available: {cart_item.product.stock}, Requested: {cart_item.quantity}'
-            }), 400
-        
-        # Calculate item total and add to order items
-        item_total = cart_item.product.price * cart_item.quantity
-        total_amount += item_total
-        
-        order_items.append({
-            'product_id': cart_item.product.id,
-            'quantity': cart_item.quantity,
-            'price': cart_item.product.price
-        })
+    for cart_item in cart.items:
+        total_amount += cart_item.product.price * cart_item.quantity
+        quantities[cart_item.product_id] = quantities.get(cart_item.product_id, 0) + cart_item.quantity
+        order_items.append(OrderItem(
+            product=cart_item.product,
+            quantity=cart_item.quantity,
+            price=cart_item.product.price
+        ))
+    
+    # Reserve stock for every line in one atomic, batched UPDATE
+    try:
+        reserve_stock(quantities)
+    except InsufficientStock:
+        db.session.rollback()
+        shortage = find_shortage(quantities)
+        if shortage is None:
+            return jsonify({'message': 'Insufficient stock'}), 400
+        product, requested = shortage
+        if product is None:
+            return jsonify({'message': 'A product in your cart is no longer available'}), 400
+        return jsonify({
+            'message': f'Insufficient stock for {product.name}. Available: {product.stock}, Requested: {requested}'
+        }), 400
     
     # Create order
     order = Order(
         user_id=user_id,
         total_amount=total_amount,
         shipping_address=data['shipping_address'],
-        status='pending'
+        status='pending',
+        items=order_items
     )
     db.session.add(order)
-    db.session.flush()  # Get order ID
-    
-    # Create order items and update stock
-    for item_data in order_items:
-        order_item = OrderItem(
-            order_id=order.id,
-            product_id=item_data['product_id'],
-            quantity=item_data['quantity'],
-            price=item_data['price']
-        )
-        db.session.add(order_item)
-        
-        # Update product stock
-        product = Product.query.get(item_data['product_id'])
-        product.stock -= item_data['quantity']
+    record_order_created(order)
     
     # Clear cart
-    CartItem.query.filter_by(cart_id=user.cart.id).delete()
+    CartItem.query.filter_by(cart_id=cart.id).delete()
+    Cart.bump_version(user_id)
     db.session.commit()
+    catalog_cache.bump()
     
-    return jsonify(order_schema.dump(order)), 201
+    return jsonify(dump_order(order)), 201
 
 @order_bp.route('/orders/<int:order_id>', methods=['PUT'])
 @jwt_required()
 def update_order(order_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    principal = current_principal()
+    user_id = principal.id
     
-    order = Order.query.get_or_404(order_id)
+    order = _get_order_or_404(order_id)
     
     # Only admin can update orders, or users can update their own pending orders
-    if not user.is_admin and (order.user_id != user_id or order.status != 'pending'):
+    if not principal.is_admin and (order.user_id != user_id or order.status != 'pending'):
         return jsonify({'message': 'Access denied'}), 403
     
     # Validate input data
@@ -124,24 +165,25 @@ def update_order(order_id):
     
     # Update order fields
     if 'status' in data:
+        record_status_change(order, order.status, data['status'])
         order.status = data['status']
     if 'shipping_address' in data:
         order.shipping_address = data['shipping_address']
     
     db.session.commit()
     
-    return jsonify(order_schema.dump(order)), 200
+    return jsonify(dump_order(order)), 200
 
 @order_bp.route('/orders/<int:order_id>/cancel', methods=['POST'])
 @jwt_required()
 def cancel_order(order_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    principal = current_principal()
+    user_id = principal.id
     
-    order = Order.query.get_or_404(order_id)
+    order = _get_order_or_404(order_id)
     
     # Check if user owns the order or is admin
-    if order.user_id != user_id and not user.is_admin:
+    if order.user_id != user_id and not principal.is_admin:
         return jsonify({'message': 'Access denied'}), 403
     
     # Only pending or processing orders can be cancelled
@@ -149,24 +191,34 @@ def cancel_order(order_id):
         return jsonify({'message': 'Order cannot be cancelled at this stage'}), 400
     
     # Restore product stock
+    quantities = {}
     for order_item in order.items:
-        product = Product.query.get(order_item.product_id)
-        product.stock += order_item.quantity
+        quantities[order_item.product_id] = quantities.get(order_item.product_id, 0) + order_item.quantity
+    release_stock(quantities)
     
+    record_status_change(order, order.status, 'cancelled')
     order.status = 'cancelled'
     db.session.commit()
+    catalog_cache.bump()
     
-    return jsonify(order_schema.dump(order)), 200
+    return jsonify(dump_order(order)), 200
 
 @order_bp.route('/orders/user/<int:user_id>', methods=['GET'])
+@query_budget(2)
 @jwt_required()
 def get_user_orders(user_id):
-    current_user_id = get_jwt_identity()
-    current_user = User.query.get(current_user_id)
+    principal = current_principal()
+    current_user_id = principal.id
     
     # Only admin can view other users' orders
-    if user_id != current_user_id and not current_user.is_admin:
+    if user_id != current_user_id and not principal.is_admin:
         return jsonify({'message': 'Access denied'}), 403
     
-    orders = Order.query.filter_by(user_id=user_id).order_by(Order.created_at.desc()).all()
-    return jsonify(orders_schema.dump(orders)), 200
\ No newline at end of file
+    try:
+        page = _order_page(Order.query.filter_by(user_id=user_id))
+    except InvalidOrderQuery as e:
+        return jsonify({'message': str(e)}), 400
+    except InvalidCursor:
+        return jsonify({'message': 'Invalid cursor'}), 400
+    
+    return jsonify(page), 200
\ No newline at end of file
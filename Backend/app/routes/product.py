@@ -1,30 +1,94 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from app import db
+from flask import Blueprint, request, jsonify, abort
+from app import db, catalog_cache
 from app.models.product import Product
-from app.models.user import User
+from app.utils.auth import admin_required
+from app.utils.catalog import InvalidCatalogQuery, build_product_query
+from app.utils.http_cache import CatalogPayload, catalog_response
+from app.utils.instrumentation import query_budget
+from app.utils.pagination import InvalidCursor, paginate_keyset, parse_limit
+from app.utils.rollups import record_product_created, record_product_deleted
+from app.utils.search import search_products
 
 product_bp = Blueprint('product', __name__)
 
+def _cache_key(name):
+    """Key a catalog read by endpoint and its (order-insensitive) query string"""
+    return (name, tuple(sorted(request.args.items(multi=True))))
+
+def _load_product_page(args):
+    query, sort_column, descending = build_product_query(args)
+    limit = parse_limit(args.get('limit', type=int))
+    products, next_cursor = paginate_keyset(
+        query, sort_column, Product.id, limit,
+        after=args.get('after'), descending=descending
+    )
+    return CatalogPayload({
+        'products': [product.to_dict() for product in products],
+        'next_cursor': next_cursor
+    }, last_modified=catalog_cache.last_modified)
+
 @product_bp.route('/products', methods=['GET'])
+@query_budget(2)  # catalog version + load on a cache miss
 def get_products():
-    products = Product.query.all()
-    return jsonify([product.to_dict() for product in products]), 200
+    try:
+        page = catalog_cache.get_or_load(
+            _cache_key('products'), lambda: _load_product_page(request.args)
+        )
+    except InvalidCatalogQuery as e:
+        return jsonify({'message': str(e)}), 400
+    except InvalidCursor:
+        return jsonify({'message': 'Invalid cursor'}), 400
+    
+    return catalog_response(page)
+
+@product_bp.route('/products/search', methods=['GET'])
+@query_budget(2)  # catalog version + load on a cache miss
+def search():
+    term = request.args.get('q', '').strip()
+    if not term:
+        return jsonify({'message': 'Search query is required'}), 400
+    
+    limit = parse_limit(request.args.get('limit', type=int))
+    def load():
+        products = search_products(term, limit)
+        return CatalogPayload({'products': [product.to_dict() for product in products]},
+                              last_modified=catalog_cache.last_modified)
+    
+    return catalog_response(catalog_cache.get_or_load(_cache_key('search'), load))
+
+@product_bp.route('/products/categories', methods=['GET'])
+@query_budget(2)  # catalog version + load on a cache miss
+def get_categories():
+    def load():
+        rows = db.session.query(Product.category).filter(
+            Product.category.isnot(None), Product.category != ''
+        ).distinct().order_by(Product.category).all()
+        return CatalogPayload([row.category for row in rows], last_modified=catalog_cache.last_modified)
+    
+    return catalog_response(catalog_cache.get_or_load(('categories',), load))
+
+@product_bp.route('/products/cache/stats', methods=['GET'])
+@admin_required()
+def get_cache_stats():
+    return jsonify(catalog_cache.stats()), 200
 
 @product_bp.route('/products/<int:product_id>', methods=['GET'])
+@query_budget(2)  # catalog version + load on a cache miss
 def get_product(product_id):
-    product = Product.query.get_or_404(product_id)
-    return jsonify(product.to_dict()), 200
+    def load():
+        product = Product.query.get(product_id)
+        if product is None:
+            return None
+        return CatalogPayload(product.to_dict(), last_modified=catalog_cache.last_modified)
+    
+    payload = catalog_cache.get_or_load(('product', product_id), load)
+    if payload is None:
+        abort(404)
+    return catalog_response(payload)
 
 @product_bp.route('/products', methods=['POST'])
-@jwt_required()
+@admin_required()
 def create_product():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user.is_admin:
-        return jsonify({'message': 'Admin access required'}), 403
-
     data = request.get_json()
     product = Product(
         name=data['name'],
@@ -36,19 +100,15 @@ def create_product():
     )
     
     db.session.add(product)
+    record_product_created()
     db.session.commit()
+    catalog_cache.bump()
     
     return jsonify(product.to_dict()), 201
 
 @product_bp.route('/products/<int:product_id>', methods=['PUT'])
-@jwt_required()
+@admin_required()
 def update_product(product_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user.is_admin:
-        return jsonify({'message': 'Admin access required'}), 403
-
     product = Product.query.get_or_404(product_id)
     data = request.get_json()
     
@@ -60,19 +120,16 @@ def update_product(product_id):
     product.category = data.get('category', product.category)
     
     db.session.commit()
+    catalog_cache.bump()
     return jsonify(product.to_dict()), 200
 
 @product_bp.route('/products/<int:product_id>', methods=['DELETE'])
-@jwt_required()
+@admin_required()
 def delete_product(product_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user.is_admin:
-        return jsonify({'message': 'Admin access required'}), 403
-
     product = Product.query.get_or_404(product_id)
     db.session.delete(product)
+    record_product_deleted()
     db.session.commit()
+    catalog_cache.bump()
     
     return jsonify({'message': 'Product deleted successfully'}), 200
\ No newline at end of file
@@ -1,20 +1,17 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from app import db
+from sqlalchemy.exc import IntegrityError
+from app import db, limiter
 from app.models.user import User
-from app.models.cart import Cart
+from app.utils.auth import identity_claims
+from app.utils.rollups import record_new_user
 
 user_bp = Blueprint('user', __name__)
 
 @user_bp.route('/signup', methods=['POST'])
+@limiter.limit('signup')
 def signup():
     data = request.get_json()
-    
-    if User.query.filter_by(username=data.get('username')).first():
-        return jsonify({'message': 'Username already exists'}), 400
-    
-    if User.query.filter_by(email=data.get('email')).first():
-        return jsonify({'message': 'Email already exists'}), 400
 
     user = User(
         username=data['username'],
@@ -30,15 +27,21 @@ def signup():
     elif data.get('admin_key') == 'YOUR_ADMIN_SECRET_KEY':  # Set this in your .env
         user.is_admin = True
     
-    db.session.add(user)
-    db.session.commit()
-    
-    # Create a cart for the user
-    cart = Cart(user_id=user.id)
-    db.session.add(cart)
-    db.session.commit()
+    # One transaction; the unique constraints detect taken usernames/emails,
+    # and the cart is created on the user's first cart write
+    try:
+        db.session.add(user)
+        record_new_user()
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        if User.query.filter_by(username=data['username']).first():
+            return jsonify({'message': 'Username already exists'}), 400
+        if User.query.filter_by(email=data['email']).first():
+            return jsonify({'message': 'Email already exists'}), 400
+        raise
 
-    access_token = create_access_token(identity=user.id)
+    access_token = create_access_token(identity=user.id, additional_claims=identity_claims(user))
     return jsonify({
         'message': 'User created successfully',
         'access_token': access_token,
@@ -46,12 +49,18 @@ def signup():
     }), 201
 
 @user_bp.route('/login', methods=['POST'])
+@limiter.limit('login')
 def login():
     data = request.get_json()
     user = User.query.filter_by(email=data.get('email')).first()
     
     if user and user.check_password(data.get('password')):
-        access_token = create_access_token(identity=user.id)
+        # Upgrade hashes made with older parameters while we have the password
+        if user.password_needs_rehash():
+            user.set_password(data.get('password'))
+            db.session.commit()
+        
+        access_token = create_access_token(identity=user.id, additional_claims=identity_claims(user))
         return jsonify({
             'access_token': access_token,
             'user': user.to_dict()
@@ -1,4 +1,4 @@
 from app.schemas.user_schema import UserSchema
 from app.schemas.product_schema import ProductSchema
-from app.schemas.cart_schema import CartSchema, CartItemSchema
+from app.schemas.cart_schema import CartSchema, CartItemSchema, CartOperationSchema, CartPatchSchema
 from app.schemas.order_schema import OrderSchema, OrderItemSchema, CreateOrderSchema, UpdateOrderSchema
\ No newline at end of file
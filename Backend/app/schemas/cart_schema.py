@@ -1,4 +1,7 @@
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate, validates_schema, ValidationError
+
+CART_OPERATIONS = ('add', 'set', 'remove')
+MAX_CART_OPERATIONS = 100
 
 class CartItemSchema(Schema):
     id = fields.Int(dump_only=True)
@@ -12,5 +15,26 @@ class CartSchema(Schema):
     items = fields.Nested(CartItemSchema, many=True)
     total = fields.Float(dump_only=True)
 
+class CartOperationSchema(Schema):
+    op = fields.Str(required=True, validate=validate.OneOf(CART_OPERATIONS))
+    product_id = fields.Int(required=True, strict=True)
+    quantity = fields.Int(strict=True, validate=validate.Range(min=0))
+    
+    @validates_schema
+    def validate_quantity(self, data, **kwargs):
+        """``add`` needs a positive quantity, ``set`` any quantity (0 removes)"""
+        if data.get('op') == 'add' and data.get('quantity', 1) < 1:
+            raise ValidationError('Must be at least 1 for add.', 'quantity')
+        if data.get('op') == 'set' and 'quantity' not in data:
+            raise ValidationError('Required for set.', 'quantity')
+
+class CartPatchSchema(Schema):
+    operations = fields.List(
+        fields.Nested(CartOperationSchema),
+        required=True,
+        validate=validate.Length(min=1, max=MAX_CART_OPERATIONS)
+    )
+
 cart_schema = CartSchema()
-cart_item_schema = CartItemSchema()
\ No newline at end of file
+cart_item_schema = CartItemSchema()
+cart_patch_schema = CartPatchSchema()
@@ -0,0 +1,105 @@
+"""Compile marshmallow schemas into specialized dump functions.
+
+``schema.dump`` looks up every field's accessor, runs hooks and dispatches
+through ``Field.serialize`` for each value of each object. For read-heavy
+endpoints that cost dominates, so ``compile_schema`` generates one plain
+Python function per schema instead: attribute reads and type conversions are
+written out inline, keys are fixed in declaration order, nested schemas are
+compiled recursively and derived fields call their function directly.
+
+Schemas stay the source of truth and keep doing input validation; only the
+dump side is compiled. Field types without a specialization fall back to
+``Field.serialize``, so output always matches ``schema.dump`` for the
+objects the schema is used with (model instances with every attribute).
+"""
+from marshmallow import fields
+from marshmallow.utils import get_func_args, missing
+
+_SCALARS = {
+    fields.Integer: 'int',
+    fields.Float: 'float',
+    fields.String: 'str',
+}
+
+
+def _has_dump_hooks(schema):
+    return any(tag[0] in ('pre_dump', 'post_dump') and names
+               for tag, names in schema._hooks.items())
+
+
+def _scalar_expr(field, var):
+    """Inline conversion for a plain scalar field, or None if it needs the field"""
+    for field_class, converter in _SCALARS.items():
+        if isinstance(field, field_class) and type(field)._serialize is field_class._serialize:
+            if getattr(field, 'as_string', False):
+                return None
+            return f'None if {var} is None else {converter}({var})'
+    if type(field) in (fields.DateTime, fields.Date) and field.format in (None, 'iso'):
+        return f'None if {var} is None else {var}.isoformat()'
+    if type(field) is fields.Raw:
+        return var
+    return None
+
+
+def compile_schema(schema):
+    """Return a function that dumps like ``schema.dump`` for model instances.
+
+    Honors ``only``/``exclude``/``load_only``, ``data_key``, ``attribute``
+    and ``many``. Schemas with ``pre_dump``/``post_dump`` hooks are not
+    compiled; their own ``dump`` is returned instead.
+    """
+    if _has_dump_hooks(schema):
+        return schema.dump
+
+    namespace = {'_missing': missing}
+    body, items, optional = [], [], []
+
+    for index, (name, field) in enumerate(schema.dump_fields.items()):
+        key = field.data_key if field.data_key is not None else name
+        attribute = field.attribute or name
+        var = f'v{index}'
+
+        if type(field) is fields.Function and len(get_func_args(field.serialize_func)) == 1:
+            namespace[f'_f{index}'] = field.serialize_func
+            items.append((key, f'_f{index}(obj)'))
+            continue
+
+        if isinstance(field, (fields.Function, fields.Method)):
+            namespace[f'_f{index}'] = field
+            items.append((key, f'_f{index}._serialize(None, {name!r}, obj)'))
+            continue
+
+        if isinstance(field, fields.Nested) and attribute.isidentifier():
+            namespace[f'_n{index}'] = compile_schema(field.schema)
+            body.append(f'    {var} = obj.{attribute}')
+            items.append((key, f'None if {var} is None else _n{index}({var})'))
+            continue
+
+        if attribute.isidentifier():
+            expr = _scalar_expr(field, var)
+            if expr is not None:
+                body.append(f'    {var} = obj.{attribute}')
+                items.append((key, expr))
+                continue
+
+        # Anything else goes through the field itself
+        namespace[f'_f{index}'] = field
+        items.append((key, f'_f{index}.serialize({name!r}, obj, _get)'))
+        optional.append(key)
+
+    namespace['_get'] = schema.get_attribute
+    entries = ''.join(f'\n        {key!r}: {expr},' for key, expr in items)
+    body.append(f'    data = {{{entries}\n    }}')
+    for key in optional:
+        body.append(f'    if data[{key!r}] is _missing:\n        del data[{key!r}]')
+    body.append('    return data')
+
+    source = 'def dump_one(obj):\n' + '\n'.join(body) + '\n'
+    if schema.many:
+        source += '\ndef dump_many(objs):\n    return [dump_one(obj) for obj in objs]\n'
+
+    name = f'<compiled {type(schema).__name__}>'
+    exec(compile(source, name, 'exec'), namespace)
+    dump = namespace['dump_many' if schema.many else 'dump_one']
+    dump.source = source
+    return dump
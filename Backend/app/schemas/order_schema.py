@@ -1,14 +1,18 @@
 from marshmallow import Schema, fields, validate, post_load
 from datetime import datetime
+from app.schemas.compiler import compile_schema
+from app.schemas.product_schema import ProductSchema
 
 class OrderItemSchema(Schema):
     id = fields.Int(dump_only=True)
     order_id = fields.Int(dump_only=True)
     product_id = fields.Int(required=True)
-    product = fields.Dict(dump_only=True)  # Nested product data
+    # Product as it is now; price is what the order was charged, so no stock here
+    product = fields.Nested(ProductSchema, only=('id', 'name', 'price', 'image_url', 'category'),
+                            dump_only=True)
     quantity = fields.Int(required=True, validate=validate.Range(min=1))
     price = fields.Float(required=True, validate=validate.Range(min=0))
-    subtotal = fields.Float(dump_only=True)
+    subtotal = fields.Function(lambda item: item.quantity * item.price, dump_only=True)
     
     @post_load
     def make_order_item(self, data, **kwargs):
@@ -35,6 +39,10 @@ orders_schema = OrderSchema(many=True)
 order_item_schema = OrderItemSchema()
 order_items_schema = OrderItemSchema(many=True)
 
+# Compiled dumpers for the read paths; same output as order_schema.dump
+dump_order = compile_schema(order_schema)
+dump_orders = compile_schema(orders_schema)
+
 # Simplified schemas for specific use cases
 class CreateOrderSchema(Schema):
     shipping_address = fields.Str(required=True, validate=validate.Length(min=10))
@@ -0,0 +1,39 @@
+from collections import namedtuple
+from functools import wraps
+
+from flask import jsonify
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
+
+from app.models.user import User
+
+Principal = namedtuple('Principal', ['id', 'is_admin'])
+
+
+def identity_claims(user):
+    """Authorization claims to embed in a user's access token"""
+    return {'is_admin': bool(user.is_admin)}
+
+
+def current_principal():
+    """Return the authenticated caller as read from the token's claims"""
+    user_id = get_jwt_identity()
+    claims = get_jwt()
+    if 'is_admin' in claims:
+        return Principal(user_id, claims['is_admin'])
+
+    # Tokens issued before role claims were added
+    user = User.query.get(user_id)
+    return Principal(user_id, bool(user and user.is_admin))
+
+
+def admin_required():
+    """Like ``jwt_required()``, but also require the admin claim"""
+    def wrapper(fn):
+        @wraps(fn)
+        def decorator(*args, **kwargs):
+            verify_jwt_in_request()
+            if not current_principal().is_admin:
+                return jsonify({'message': 'Admin access required'}), 403
+            return fn(*args, **kwargs)
+        return decorator
+    return wrapper
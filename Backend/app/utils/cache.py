@@ -0,0 +1,204 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe LRU cache with a size bound and per-entry TTL.
+
+    Keeps hit, miss and eviction counters; expired entries count as misses
+    and are dropped when they are next looked up or reach the LRU end.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+                self.evictions += 1
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+def _now():
+    # Timestamps are stored as naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class MemoryVersion:
+    """Catalog version held in this process; only correct with one worker"""
+
+    def __init__(self):
+        self._state = (0, None)
+        self._lock = threading.Lock()
+
+    def get(self):
+        """``(version, time of the last bump)``"""
+        return self._state
+
+    def bump(self):
+        with self._lock:
+            self._state = (self._state[0] + 1, _now())
+
+
+class DatabaseVersion:
+    """Catalog version in the one-row ``catalog_version`` table.
+
+    Every worker reads it (one primary-key lookup) before using its local
+    cache, so a write seen by any worker invalidates them all. ``bump()``
+    commits, so call it after the write itself has been committed.
+    """
+
+    def get(self):
+        """``(version, time of the last bump)``"""
+        from app import db
+        from app.models.catalog import CatalogVersion
+        row = db.session.query(CatalogVersion.version, CatalogVersion.updated_at).filter_by(id=1).first()
+        return (row.version, row.updated_at) if row is not None else (0, None)
+
+    def bump(self):
+        from app import db
+        from app.models.catalog import CatalogVersion
+        from app.utils.upsert import dialect_insert
+        now = _now()
+        stmt = dialect_insert(CatalogVersion).values(id=1, version=1, updated_at=now)
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=['id'], set_={'version': CatalogVersion.version + 1, 'updated_at': now}
+        ))
+        db.session.commit()
+
+
+VERSION_STORES = {
+    'database': DatabaseVersion,
+    'memory': MemoryVersion,
+}
+
+
+class CatalogCache:
+    """Read-through cache for catalog reads, invalidated by a catalog version.
+
+    Every write that changes what a catalog read returns (product CRUD,
+    order stock changes) calls ``bump()`` after committing. Entries are
+    keyed by the version they were loaded under, so a bump makes all of
+    them unreachable at once and a load that raced with a write is never
+    served under the new version.
+
+    ``CATALOG_VERSION_STORE`` picks where the version lives: ``database``
+    (default) shares it between workers, so no worker serves a read from
+    before a completed write; ``memory`` keeps it per process and saves the
+    version lookup, for single-worker setups. The store also records when
+    the version was last bumped; ``last_modified`` is that time as read by
+    the current request, for use as the Last-Modified of what it loads.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._store = MemoryVersion()
+        self._seen = None
+        self._local = threading.local()
+        self.invalidations = 0
+        self._cache = LRUCache()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        store = app.config.get('CATALOG_VERSION_STORE', 'database')
+        if store not in VERSION_STORES:
+            raise ValueError(f'Unknown CATALOG_VERSION_STORE {store!r}. '
+                             f'Choose from: {", ".join(VERSION_STORES)}')
+        self._store = VERSION_STORES[store]()
+        self._seen = None
+        self._cache = LRUCache(
+            maxsize=app.config.get('CATALOG_CACHE_SIZE', 1024),
+            ttl=app.config.get('CATALOG_CACHE_TTL', 60),
+        )
+        app.extensions['catalog_cache'] = self
+
+    @property
+    def version(self):
+        return self._store.get()[0]
+
+    @property
+    def last_modified(self):
+        """When the catalog last changed, as of this thread's last version check"""
+        return getattr(self._local, 'modified', None)
+
+    def bump(self):
+        """Invalidate every cached catalog read, in every worker"""
+        self._store.bump()
+        with self._lock:
+            self.invalidations += 1
+            self._cache.clear()
+
+    def _current_version(self):
+        version, self._local.modified = self._store.get()
+        if version != self._seen:
+            # Another worker (or this one) bumped: entries under older
+            # versions can never be hit again, so free them now
+            with self._lock:
+                if version != self._seen:
+                    self._seen = version
+                    self._cache.clear()
+        return version
+
+    def get_or_load(self, key, loader):
+        """Return the cached value for ``key`` or compute it with ``loader()``"""
+        version = self._current_version()
+        value = self._cache.get((version, key), _MISSING)
+        if value is not _MISSING:
+            return value
+
+        value = loader()
+        with self._lock:
+            if self._seen == version:
+                self._cache.set((version, key), value)
+        return value
+
+    def stats(self):
+        return {
+            'version': self.version,
+            'store': type(self._store).__name__,
+            'size': len(self._cache),
+            'maxsize': self._cache.maxsize,
+            'ttl': self._cache.ttl,
+            'hits': self._cache.hits,
+            'misses': self._cache.misses,
+            'evictions': self._cache.evictions,
+            'invalidations': self.invalidations,
+        }
@@ -0,0 +1,108 @@
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+
+from app import db
+from app.models.cart import CartItem
+from app.models.product import Product
+from app.utils.inventory import InsufficientStock
+
+
+class UnknownProduct(LookupError):
+    """Raised when a cart operation names a product that does not exist"""
+
+
+def target_quantities(cart, operations):
+    """Replay ``operations`` over the cart's current lines.
+
+    Returns ``{product_id: quantity}`` for every product an operation
+    touched; a quantity of 0 means the line goes away.
+    """
+    current = {item.product_id: item.quantity for item in cart.items} if cart else {}
+    targets = {}
+    for operation in operations:
+        product_id = operation['product_id']
+        quantity = targets.get(product_id, current.get(product_id, 0))
+        if operation['op'] == 'add':
+            quantity += operation.get('quantity', 1)
+        elif operation['op'] == 'set':
+            quantity = operation['quantity']
+        else:
+            quantity = 0
+        targets[product_id] = quantity
+    return targets
+
+
+def check_stock(targets):
+    """Validate every resulting line against stock with one query.
+
+    Returns the checked products by id.
+    """
+    wanted = [product_id for product_id, quantity in targets.items() if quantity > 0]
+    if not wanted:
+        return {}
+    products = {product.id: product for product in
+                Product.query.filter(Product.id.in_(wanted)).all()}
+    for product_id in sorted(wanted):
+        product = products.get(product_id)
+        if product is None:
+            raise UnknownProduct(product_id)
+        if product.stock < targets[product_id]:
+            raise InsufficientStock(
+                f'Insufficient stock for {product.name}. '
+                f'Available: {product.stock}, Requested: {targets[product_id]}'
+            )
+    return products
+
+
+def apply_operations(cart, operations):
+    """Apply a batch of cart operations to ``cart`` in the current transaction.
+
+    Operations are folded into one target quantity per product first, so the
+    stock check is one query and each line is written at most once; the
+    writes go out in a single flush. ``cart.items`` is kept current, so the
+    cart can be serialized afterwards without reloading it.
+    Returns ``(changed_ids, removed_ids)``.
+    """
+    targets = target_quantities(cart, operations)
+    products = check_stock(targets)
+
+    changed, removed_ids = [], []
+    for product_id, quantity in targets.items():
+        item = cart.find_item(product_id=product_id)
+        if item is None:
+            if quantity > 0:
+                item = CartItem(product=products[product_id], quantity=quantity)
+                cart.items.append(item)
+                changed.append(item)
+        elif quantity > 0:
+            item.quantity = quantity
+            changed.append(item)
+        else:
+            # delete-orphan cascade deletes the row
+            cart.items.remove(item)
+            removed_ids.append(item.id)
+
+    db.session.flush()
+    return [item.id for item in changed], removed_ids
+
+
+def cart_delta(cart_id, version, changed_ids=(), removed_ids=()):
+    """A cart response holding only what a mutation changed.
+
+    Carries the changed lines, the ids of removed lines, the new version and
+    a total summed in SQL, so unchanged lines are neither loaded nor sent.
+    """
+    items = []
+    if changed_ids:
+        items = CartItem.query.options(joinedload(CartItem.product)) \
+            .filter(CartItem.id.in_(changed_ids)).order_by(CartItem.id).all()
+    total = db.session.query(func.coalesce(func.sum(CartItem.quantity * Product.price), 0)) \
+        .join(Product, Product.id == CartItem.product_id) \
+        .filter(CartItem.cart_id == cart_id).scalar()
+    return {
+        'id': cart_id,
+        'version': version,
+        'items': [item.to_dict() for item in items],
+        'removed': sorted(removed_ids),
+        'total': total
+    }
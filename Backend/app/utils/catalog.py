@@ -0,0 +1,76 @@
+import math
+
+from app.models.product import Product
+from app.utils.search import match_clause
+
+# Sort orders accepted by GET /products: name -> (sort column, descending)
+PRODUCT_SORTS = {
+    'id': (Product.id, False),
+    'name': (Product.name, False),
+    'price-low': (Product.price, False),
+    'price-high': (Product.price, True),
+}
+
+TRUE_VALUES = ('1', 'true', 'yes')
+FALSE_VALUES = ('0', 'false', 'no')
+
+
+class InvalidCatalogQuery(ValueError):
+    """Raised when catalog query parameters cannot be applied"""
+
+
+def _parse_price(args, name):
+    value = args.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        price = float(value)
+    except ValueError:
+        raise InvalidCatalogQuery(f'{name} must be a number')
+    if not math.isfinite(price):
+        raise InvalidCatalogQuery(f'{name} must be a number')
+    if price < 0:
+        raise InvalidCatalogQuery(f'{name} must not be negative')
+    return price
+
+
+def build_product_query(args):
+    """Translate catalog query parameters into a filtered ``Product`` query.
+
+    Supported parameters are ``category``, ``min_price``, ``max_price``,
+    ``in_stock``, ``q`` and ``sort``. Returns ``(query, sort_column,
+    descending)`` so the caller can paginate on the chosen sort key.
+    """
+    sort = args.get('sort', 'id')
+    if sort not in PRODUCT_SORTS:
+        raise InvalidCatalogQuery(f"Invalid sort. Choose from: {', '.join(PRODUCT_SORTS)}")
+    sort_column, descending = PRODUCT_SORTS[sort]
+
+    query = Product.query
+
+    category = args.get('category')
+    if category and category != 'all':
+        query = query.filter(Product.category == category)
+
+    min_price = _parse_price(args, 'min_price')
+    max_price = _parse_price(args, 'max_price')
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise InvalidCatalogQuery('min_price must not exceed max_price')
+    if min_price is not None:
+        query = query.filter(Product.price >= min_price)
+    if max_price is not None:
+        query = query.filter(Product.price <= max_price)
+
+    in_stock = args.get('in_stock', '').lower()
+    if in_stock in TRUE_VALUES:
+        query = query.filter(Product.stock > 0)
+    elif in_stock in FALSE_VALUES:
+        query = query.filter(Product.stock <= 0)
+    elif in_stock:
+        raise InvalidCatalogQuery('in_stock must be true or false')
+
+    term = args.get('q', '').strip()
+    if term:
+        query = query.filter(match_clause(term))
+
+    return query, sort_column, descending
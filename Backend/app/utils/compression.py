@@ -0,0 +1,87 @@
+import gzip
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+# Preferred first when the client rates encodings equally
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+DEFAULT_MIMETYPES = ('application/json', 'text/html', 'text/plain', 'text/css',
+                     'application/javascript')
+
+
+def negotiate():
+    """The best encoding the client accepts for this request, or None"""
+    if not current_app.config['COMPRESS_ENABLED']:
+        return None
+    return request.accept_encodings.best_match(ENCODINGS)
+
+
+def compress(body, encoding):
+    """Compress ``body`` bytes with the configured level for ``encoding``.
+
+    gzip output is deterministic (no timestamp), so the same body always
+    compresses to the same bytes on every worker.
+    """
+    config = current_app.config
+    if encoding == 'br':
+        return brotli.compress(body, quality=config['COMPRESS_BR_LEVEL'])
+    return gzip.compress(body, compresslevel=config['COMPRESS_LEVEL'], mtime=0)
+
+
+def variant_etag(etag, encoding):
+    """ETag for an encoded representation; each encoding gets its own tag"""
+    return f'{etag}-{encoding}' if encoding else etag
+
+
+class Compressor:
+    """Compress responses with brotli or gzip, as negotiated by Accept-Encoding.
+
+    Applies to responses of ``COMPRESS_MIMETYPES`` at least
+    ``COMPRESS_MIN_SIZE`` bytes long; ``COMPRESS_LEVEL`` (gzip) and
+    ``COMPRESS_BR_LEVEL`` (brotli) trade CPU for size. Responses that already
+    carry a Content-Encoding, such as precompressed catalog payloads, are
+    left alone. brotli is used only when the ``brotli`` package is installed.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('COMPRESS_ENABLED', True)
+        app.config.setdefault('COMPRESS_MIN_SIZE', 500)
+        app.config.setdefault('COMPRESS_LEVEL', 6)
+        app.config.setdefault('COMPRESS_BR_LEVEL', 4)
+        app.config.setdefault('COMPRESS_MIMETYPES', DEFAULT_MIMETYPES)
+        app.extensions['compressor'] = self
+        app.after_request(self._compress_response)
+
+    def _compress_response(self, response):
+        config = current_app.config
+        if response.mimetype not in config['COMPRESS_MIMETYPES']:
+            return response
+        response.vary.add('Accept-Encoding')
+
+        if (response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.status_code < 200 or response.status_code in (204, 206, 304)):
+            return response
+        encoding = negotiate()
+        if encoding is None:
+            return response
+
+        body = response.get_data()
+        if len(body) < config['COMPRESS_MIN_SIZE']:
+            return response
+        response.set_data(compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(variant_etag(etag, encoding), weak)
+        return response
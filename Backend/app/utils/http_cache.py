@@ -0,0 +1,93 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+from flask import Response, current_app, request
+
+from app.utils.compression import compress, negotiate, variant_etag
+from app.utils.json_provider import encode
+
+
+class CatalogPayload:
+    """A catalog response body with its validators, built once per cache entry.
+
+    The data is encoded to canonical JSON bytes up front, and those bytes
+    are both the cached response body and the input to the ETag, so it is
+    strong, identical across workers, and changes whenever any served field
+    changes. Cache hits are sent without encoding anything, and compressed
+    variants are kept alongside the body, so each is compressed once per
+    cache entry rather than once per response.
+    """
+
+    __slots__ = ('body', 'etag', 'last_modified', 'compressed')
+
+    def __init__(self, data, last_modified=None):
+        self.body = encode(data)
+        self.etag = hashlib.sha256(self.body).hexdigest()[:32]
+        if last_modified is not None and last_modified.tzinfo is None:
+            # Timestamps are stored as naive UTC
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        self.last_modified = last_modified
+        self.compressed = {}
+
+    def encoded(self, encoding):
+        """The body in ``encoding`` (None for identity), compressed on first use"""
+        if encoding is None:
+            return self.body
+        body = self.compressed.get(encoding)
+        if body is None:
+            body = self.compressed[encoding] = compress(self.body, encoding)
+        return body
+
+
+def _last_modified(payload):
+    """Last-Modified for a payload, or None until it can tell changes apart.
+
+    HTTP dates have one-second resolution, so a change later in the same
+    second would carry the same date and a client revalidating with
+    If-Modified-Since would get a stale 304. A timestamp is only used once
+    its second has passed.
+    """
+    if payload.last_modified is None:
+        return None
+    last_modified = payload.last_modified.replace(microsecond=0)
+    if last_modified + timedelta(seconds=1) > datetime.now(timezone.utc):
+        return None
+    return last_modified
+
+
+def _is_fresh(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def catalog_response(payload, status=200):
+    """Serve a catalog payload, or an empty 304 if the client's copy is fresh.
+
+    Freshness is checked before the body is serialized, so revalidation
+    requests cost neither a query (on a cache hit) nor JSON encoding. The
+    body is sent in the negotiated encoding, each with its own ETag.
+    """
+    encoding = None
+    if len(payload.body) >= current_app.config['COMPRESS_MIN_SIZE']:
+        encoding = negotiate()
+    etag = variant_etag(payload.etag, encoding)
+    last_modified = _last_modified(payload)
+
+    if _is_fresh(etag, last_modified):
+        response = Response(status=304)
+    else:
+        response = current_app.json.response(payload.encoded(encoding))
+        response.status_code = status
+        if encoding is not None:
+            response.headers['Content-Encoding'] = encoding
+
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config.get('CATALOG_MAX_AGE', 60)
+    return response
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+
+from flask import current_app, jsonify, make_response, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models.idempotency import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+_purge_lock = threading.Lock()
+_next_purge = 0.0
+
+
+def _now():
+    # Timestamps are stored as naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _request_hash():
+    """Fingerprint of what the request asks for, to detect reused keys"""
+    body = request.get_json(silent=True)
+    canonical = json.dumps([request.method, request.path, body], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _purge_expired(cutoff):
+    """Delete expired keys, at most once per purge interval per process"""
+    global _next_purge
+    now = time.monotonic()
+    with _purge_lock:
+        if now < _next_purge:
+            return
+        _next_purge = now + current_app.config.get('IDEMPOTENCY_PURGE_INTERVAL', 300)
+    IdempotencyKey.query.filter(IdempotencyKey.created_at < cutoff).delete(synchronize_session=False)
+    db.session.commit()
+
+
+def _replay(record):
+    response = current_app.response_class(record.response_body, status=record.status_code,
+                                          mimetype='application/json')
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def _release(record_id):
+    db.session.rollback()
+    IdempotencyKey.query.filter_by(id=record_id).delete(synchronize_session=False)
+    db.session.commit()
+
+
+def _take_over(record_id, stale_before):
+    """Claim a reservation whose request died without finishing.
+
+    The conditional UPDATE lets exactly one concurrent retry win, and
+    renews the lease for it.
+    """
+    taken = IdempotencyKey.query.filter(
+        IdempotencyKey.id == record_id,
+        IdempotencyKey.status_code.is_(None),
+        IdempotencyKey.created_at < stale_before,
+    ).update({'created_at': _now()}, synchronize_session=False)
+    db.session.commit()
+    return taken == 1
+
+
+def _in_progress():
+    return jsonify({'message': 'A request with this Idempotency-Key is still in progress'}), 409
+
+
+def idempotent(fn):
+    """Make a JWT-protected POST safe to retry with an ``Idempotency-Key``.
+
+    The first request with a key reserves it, runs the view and stores a
+    2xx response; retries with the same key and body get that response back
+    without running the view again. Failed responses release the key so the
+    client can retry. A reservation still unfinished after
+    ``IDEMPOTENCY_LOCK_TIMEOUT`` seconds is taken to belong to a request
+    that died, and the next retry takes it over. Keys expire after
+    ``IDEMPOTENCY_KEY_TTL`` seconds. Must be applied below ``@jwt_required()``.
+    """
+    @wraps(fn)
+    def decorator(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None:
+            return fn(*args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return jsonify({'message': f'{HEADER} must be 1-{MAX_KEY_LENGTH} characters'}), 400
+
+        user_id = get_jwt_identity()
+        request_hash = _request_hash()
+        now = _now()
+        cutoff = now - timedelta(seconds=current_app.config.get('IDEMPOTENCY_KEY_TTL', 86400))
+        _purge_expired(cutoff)
+
+        record = IdempotencyKey.query.filter_by(user_id=user_id, key=key).first()
+        if record is not None and record.created_at < cutoff:
+            db.session.delete(record)
+            db.session.commit()
+            record = None
+
+        if record is not None:
+            if record.request_hash != request_hash:
+                return jsonify({'message': f'{HEADER} was already used for a different request'}), 422
+            if record.status_code is not None:
+                return _replay(record)
+            stale_before = now - timedelta(seconds=current_app.config.get('IDEMPOTENCY_LOCK_TIMEOUT', 60))
+            if not _take_over(record.id, stale_before):
+                return _in_progress()
+            record_id = record.id
+        else:
+            # Reserve the key before doing any work, so a concurrent retry
+            # sees it; timestamps come from this clock, like the cutoffs
+            record = IdempotencyKey(user_id=user_id, key=key, request_hash=request_hash,
+                                    created_at=now)
+            db.session.add(record)
+            try:
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+                return _in_progress()
+            record_id = record.id
+
+        try:
+            response = make_response(fn(*args, **kwargs))
+        except Exception:
+            _release(record_id)
+            raise
+
+        if 200 <= response.status_code < 300:
+            IdempotencyKey.query.filter_by(id=record_id).update({
+                'status_code': response.status_code,
+                'response_body': response.get_data(as_text=True),
+            }, synchronize_session=False)
+            db.session.commit()
+        else:
+            _release(record_id)
+        return response
+    return decorator
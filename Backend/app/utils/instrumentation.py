@@ -0,0 +1,121 @@
+import re
+import time
+from collections import Counter
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+_PLACEHOLDER_LIST = re.compile(r'\(\s*(?:\?|%\(\w+\)s|%s)(?:\s*,\s*(?:\?|%\(\w+\)s|%s))*\s*\)')
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_SPACE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a request runs more statements than its query budget"""
+
+
+def statement_shape(statement):
+    """Reduce a statement to its shape, so the same query with other
+    parameters, literals or IN-list lengths compares equal"""
+    shape = _STRING.sub('?', statement)
+    shape = _NUMBER.sub('?', shape)
+    shape = _PLACEHOLDER_LIST.sub('(?)', shape)
+    return _SPACE.sub(' ', shape).strip()
+
+
+def query_budget(limit):
+    """Set the maximum number of statements a view may run per request.
+
+    Apply directly under the route decorator; overrides ``SQL_QUERY_BUDGET``.
+    """
+    def wrapper(fn):
+        fn.query_budget = limit
+        return fn
+    return wrapper
+
+
+class QueryStats:
+    __slots__ = ('count', 'duration', 'shapes')
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def repeated(self, threshold):
+        """SELECT shapes run at least ``threshold`` times: likely N+1 loads"""
+        return [(shape, n) for shape, n in self.shapes.most_common()
+                if n >= threshold and shape.upper().startswith('SELECT')]
+
+
+class SQLInstrumentation:
+    """Per-request statement counts and DB time from SQLAlchemy engine events.
+
+    When enabled (``SQL_INSTRUMENTATION``, on by default in debug and testing)
+    each response carries ``X-DB-Queries`` and ``X-DB-Time`` headers, and
+    statements repeated ``SQL_REPEAT_THRESHOLD`` times with the same shape
+    are logged as likely N+1 loads. Requests over their query budget are
+    logged, or fail with ``QueryBudgetExceeded`` if ``SQL_QUERY_BUDGET_RAISE``.
+    """
+
+    def __init__(self, app=None, db=None):
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db):
+        app.config.setdefault('SQL_INSTRUMENTATION', app.debug or app.testing)
+        app.config.setdefault('SQL_QUERY_BUDGET', None)
+        app.config.setdefault('SQL_QUERY_BUDGET_RAISE', app.testing)
+        app.config.setdefault('SQL_REPEAT_THRESHOLD', 3)
+        app.extensions['sql_instrumentation'] = self
+        if not app.config['SQL_INSTRUMENTATION']:
+            return
+
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'before_cursor_execute', self._before_execute)
+                event.listen(engine, 'after_cursor_execute', self._after_execute)
+
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info['query_started'] = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop('query_started', None)
+        if started is None or not has_request_context():
+            return
+        stats = g.get('sql_stats')
+        if stats is None:
+            return
+        stats.count += 1
+        stats.duration += time.perf_counter() - started
+        stats.shapes[statement_shape(statement)] += 1
+
+    def _start_request(self):
+        g.sql_stats = QueryStats()
+
+    def _finish_request(self, response):
+        stats = g.pop('sql_stats', None)
+        if stats is None:
+            return response
+
+        response.headers['X-DB-Queries'] = str(stats.count)
+        response.headers['X-DB-Time'] = f'{stats.duration * 1000:.2f}ms'
+
+        config = current_app.config
+        for shape, n in stats.repeated(config['SQL_REPEAT_THRESHOLD']):
+            current_app.logger.warning('Possible N+1 in %s %s: %d x %s',
+                                       request.method, request.path, n, shape[:200])
+
+        view = current_app.view_functions.get(request.endpoint)
+        budget = getattr(view, 'query_budget', config['SQL_QUERY_BUDGET'])
+        if budget is not None and stats.count > budget:
+            message = (f'{request.method} {request.path} ran {stats.count} queries, '
+                       f'over its budget of {budget}')
+            if config['SQL_QUERY_BUDGET_RAISE']:
+                raise QueryBudgetExceeded(message)
+            current_app.logger.warning(message)
+        return response
@@ -0,0 +1,101 @@
+from sqlalchemy import Integer, bindparam, column, update, values
+from sqlalchemy.orm.util import identity_key
+
+from app import db
+from app.models.product import Product
+
+_product = Product.__table__
+
+# Conditional decrement: matches no row when the product is short, so the
+# check and the write happen atomically in the database
+_RESERVE = update(_product).where(
+    _product.c.id == bindparam('b_product_id'),
+    _product.c.stock >= bindparam('b_quantity'),
+).values(stock=_product.c.stock - bindparam('b_quantity'))
+
+_RELEASE = update(_product).where(
+    _product.c.id == bindparam('b_product_id'),
+).values(stock=_product.c.stock + bindparam('b_quantity'))
+
+
+def _reserve_returning(params):
+    # The same conditional decrement as one UPDATE joined to the lines as a
+    # VALUES list, returning the ids it reserved; for drivers without
+    # executemany rowcounts (psycopg2). SQLite cannot name VALUES columns.
+    lines = values(column('product_id', Integer), column('quantity', Integer), name='line').data(
+        [(row['b_product_id'], row['b_quantity']) for row in params]
+    )
+    return update(_product).where(
+        _product.c.id == lines.c.product_id,
+        _product.c.stock >= lines.c.quantity,
+    ).values(stock=_product.c.stock - lines.c.quantity).returning(_product.c.id)
+
+class InsufficientStock(Exception):
+    """Raised when a stock reservation cannot be satisfied"""
+
+
+def _params(quantities):
+    # A stable order means concurrent checkouts lock product rows in the same
+    # order and cannot deadlock against each other
+    return [{'b_product_id': product_id, 'b_quantity': quantity}
+            for product_id, quantity in sorted(quantities.items())]
+
+
+def _expire_stock(quantities):
+    # Stock changes bypass the ORM, so products already loaded in this
+    # session must re-read it; sessions may not expire on commit
+    for product_id in quantities:
+        product = db.session.identity_map.get(identity_key(Product, product_id))
+        if product is not None:
+            db.session.expire(product, ['stock'])
+
+
+def reserve_stock(quantities):
+    """Decrement stock for ``{product_id: quantity}`` in one batched statement.
+
+    That is a single UPDATE .. RETURNING on PostgreSQL and one executemany
+    on drivers that report its rowcount, such as SQLite. Raises ``InsufficientStock`` if any product is short; the caller must
+    roll back, since rows reserved before the failure stay decremented in
+    the current transaction.
+    """
+    params = _params(quantities)
+    connection = db.session.connection()
+
+    _expire_stock(quantities)
+
+    if connection.dialect.name == 'postgresql':
+        reserved = connection.execute(_reserve_returning(params)).scalars().all()
+        if set(reserved) != set(quantities):
+            raise InsufficientStock()
+        return
+
+    if connection.dialect.supports_sane_multi_rowcount:
+        result = connection.execute(_RESERVE, params)
+        if result.rowcount != len(params):
+            raise InsufficientStock()
+        return
+
+    # Drivers that cannot report executemany rowcounts: check row by row
+    for row in params:
+        if connection.execute(_RESERVE, row).rowcount != 1:
+            raise InsufficientStock()
+
+
+def release_stock(quantities):
+    """Return previously reserved stock for ``{product_id: quantity}``"""
+    db.session.connection().execute(_RELEASE, _params(quantities))
+    _expire_stock(quantities)
+
+
+def find_shortage(quantities):
+    """Return ``(product, requested)`` for the first product that is short.
+
+    ``product`` is None when the product no longer exists.
+    """
+    products = {product.id: product for product in
+                Product.query.filter(Product.id.in_(quantities)).all()}
+    for product_id, requested in sorted(quantities.items()):
+        product = products.get(product_id)
+        if product is None or product.stock < requested:
+            return product, requested
+    return None
@@ -0,0 +1,79 @@
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date
+
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+try:
+    import orjson
+except ImportError:  # optional speedup; the stdlib encoder is used instead
+    orjson = None
+
+
+def _default(o):
+    # Same conversions as Flask's default provider
+    if isinstance(o, date):
+        return http_date(o)
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+
+if orjson is not None:
+    # Dates go through _default so both encoders agree on their format
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def encode(obj, sort_keys=True):
+    """Encode ``obj`` to compact JSON bytes, with orjson when installed.
+
+    Output is deterministic when ``sort_keys`` is set, so it can be hashed
+    for ETags and cached as a ready-to-send response body.
+    """
+    if orjson is not None:
+        option = _ORJSON_OPTIONS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(obj, default=_default, option=option)
+        except orjson.JSONEncodeError:
+            pass  # e.g. integers wider than 64 bits; let the stdlib try
+    # Unescaped UTF-8 like orjson, so both produce the same bytes (and ETags)
+    return json.dumps(obj, default=_default, sort_keys=sort_keys, ensure_ascii=False,
+                      separators=(',', ':')).encode()
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson when it is installed.
+
+    Falls back to Flask's stdlib-based provider otherwise, and whenever a
+    caller passes ``json.dumps`` keyword arguments orjson does not support.
+    ``response()`` also accepts an already-encoded ``bytes`` body, which is
+    sent as is, so cached payloads are not encoded again.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return encode(obj, sort_keys=self.sort_keys).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if isinstance(obj, bytes):
+            return self._app.response_class(obj, mimetype=self.mimetype)
+
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        if orjson is None or pretty:
+            return super().response(obj)
+        return self._app.response_class(encode(obj, sort_keys=self.sort_keys) + b'\n',
+                                        mimetype=self.mimetype)
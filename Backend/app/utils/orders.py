@@ -0,0 +1,95 @@
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import func, select
+
+from app.models.order import Order, OrderItem
+
+ORDER_STATUSES = ('pending', 'processing', 'shipped', 'delivered', 'cancelled')
+
+
+class InvalidOrderQuery(ValueError):
+    """Raised when order listing parameters cannot be applied"""
+
+
+def _parse_bound(args, name, end_of_range=False):
+    """Parse an ISO date or datetime; a bare ``to`` date covers that whole day"""
+    value = args.get(name)
+    if not value:
+        return None
+    try:
+        if len(value) == 10:
+            day = date.fromisoformat(value)
+            if end_of_range:
+                day += timedelta(days=1)
+            return datetime.combine(day, time.min)
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise InvalidOrderQuery(f'{name} must be an ISO 8601 date or datetime')
+    if moment.tzinfo is not None:
+        # Timestamps are stored as naive UTC
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def build_order_query(args, user_id, is_admin):
+    """Translate order listing parameters into a filtered ``Order`` query.
+
+    Supported parameters are ``status``, ``from``, ``to`` and, for admins,
+    ``user_id``. Regular users are always limited to their own orders.
+    """
+    query = Order.query
+
+    requested_user = args.get('user_id', type=int)
+    if is_admin:
+        if requested_user is not None:
+            query = query.filter(Order.user_id == requested_user)
+    else:
+        if requested_user is not None and requested_user != user_id:
+            raise PermissionError('Access denied')
+        query = query.filter(Order.user_id == user_id)
+
+    status = args.get('status')
+    if status:
+        if status not in ORDER_STATUSES:
+            raise InvalidOrderQuery(f"Invalid status. Choose from: {', '.join(ORDER_STATUSES)}")
+        query = query.filter(Order.status == status)
+
+    start = _parse_bound(args, 'from')
+    end = _parse_bound(args, 'to', end_of_range=True)
+    if start is not None:
+        query = query.filter(Order.created_at >= start)
+    if end is not None:
+        query = query.filter(Order.created_at < end)
+
+    return query
+
+
+def summary_query(query):
+    """Project an order query down to summary columns.
+
+    Item count and total quantity come from correlated aggregates over
+    ``order_item.order_id``, evaluated only for the rows on the page, so
+    no OrderItem or Product rows are loaded.
+    """
+    item_count = select(func.count(OrderItem.id)) \
+        .where(OrderItem.order_id == Order.id).scalar_subquery()
+    total_quantity = select(func.coalesce(func.sum(OrderItem.quantity), 0)) \
+        .where(OrderItem.order_id == Order.id).scalar_subquery()
+    return query.with_entities(
+        Order.id, Order.user_id, Order.total_amount, Order.status,
+        Order.created_at, Order.updated_at,
+        item_count.label('item_count'), total_quantity.label('total_quantity')
+    )
+
+
+def summary_to_dict(row):
+    return {
+        'id': row.id,
+        'user_id': row.user_id,
+        'total_amount': row.total_amount,
+        'status': row.status,
+        'created_at': row.created_at.isoformat() if row.created_at else None,
+        'updated_at': row.updated_at.isoformat() if row.updated_at else None,
+        'item_count': row.item_count,
+        'total_quantity': row.total_quantity
+    }
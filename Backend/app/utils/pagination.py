@@ -0,0 +1,91 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import String, literal, tuple_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Clamp a requested page size to the allowed range"""
+    if value is None:
+        return default
+    return max(1, min(value, maximum))
+
+
+def encode_cursor(key_value, row_id):
+    """Encode the (sort key, id) of the last row into an opaque cursor"""
+    if isinstance(key_value, datetime):
+        key_value = key_value.isoformat()
+    raw = json.dumps([key_value, row_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _coerce_key(key_value, key_column):
+    """Check a decoded sort key against the column it will be compared to"""
+    expected = key_column.type.python_type
+    if expected is datetime:
+        return datetime.fromisoformat(key_value)
+    if expected is float and isinstance(key_value, int) and not isinstance(key_value, bool):
+        return float(key_value)
+    if not isinstance(key_value, expected) or isinstance(key_value, bool):
+        raise ValueError(key_value)
+    return key_value
+
+
+def decode_cursor(cursor, key_column):
+    """Decode a cursor back into a (sort key, id) pair for ``key_column``"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        key_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(row_id, int) or isinstance(row_id, bool):
+            raise ValueError(row_id)
+        key_value = _coerce_key(key_value, key_column)
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    return key_value, row_id
+
+
+def _bind_key(query, key_value):
+    """Bind a sort key for comparison against stored values"""
+    if isinstance(key_value, datetime) and query.session.get_bind().dialect.name == 'sqlite':
+        # SQLite compares timestamps as text, and CURRENT_TIMESTAMP defaults
+        # are stored without the fractional seconds SQLAlchemy would render
+        fmt = '%Y-%m-%d %H:%M:%S.%f' if key_value.microsecond else '%Y-%m-%d %H:%M:%S'
+        return literal(key_value.strftime(fmt), String)
+    return key_value
+
+
+def paginate_keyset(query, key_column, id_column, limit, after=None, descending=False):
+    """Fetch one page of ``query`` ordered by (key_column, id_column).
+
+    The next page starts strictly after the (key, id) pair stored in the
+    ``after`` cursor, so the database seeks on the index instead of
+    scanning past skipped rows with OFFSET.
+    Returns ``(rows, next_cursor)``; ``next_cursor`` is None on the last page.
+    """
+    row_key = tuple_(key_column, id_column)
+
+    if after is not None:
+        key_value, row_id = decode_cursor(after, key_column)
+        boundary = tuple_(_bind_key(query, key_value), row_id)
+        query = query.filter(row_key < boundary if descending else row_key > boundary)
+
+    if descending:
+        query = query.order_by(key_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(key_column.asc(), id_column.asc())
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, key_column.key), getattr(last, id_column.key))
@@ -0,0 +1,111 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+
+from flask import jsonify
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = 'pbkdf2:sha256:600000'
+
+# Pool processes must not be forked from a threaded worker: a lock held by
+# another thread at fork time stays held forever in the child
+START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hash operations are already queued"""
+
+
+class PasswordHasher:
+    """Runs password hashing and verification off the request thread.
+
+    Work goes to a small ``ProcessPoolExecutor`` so key stretching cannot
+    starve other requests on the worker. At most ``PASSWORD_HASH_MAX_PENDING``
+    operations may be running or queued at once; beyond that callers get
+    ``PasswordHasherBusy`` (served as a 503) instead of waiting in line.
+    With ``PASSWORD_HASH_WORKERS = 0`` everything runs inline.
+    """
+
+    def __init__(self, app=None):
+        self.method = DEFAULT_METHOD
+        self.workers = 0
+        self.max_pending = 0
+        self.timeout = None
+        self._pool = None
+        self._pool_pid = None
+        self._slots = None
+        self._prefix = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.method = app.config.get('PASSWORD_HASH_METHOD', DEFAULT_METHOD)
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', 2)
+        self.max_pending = app.config.get('PASSWORD_HASH_MAX_PENDING', 32)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', 10)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._prefix = None
+        app.extensions['password_hasher'] = self
+        app.register_error_handler(PasswordHasherBusy, self._busy_response)
+
+    def _busy_response(self, error):
+        response = jsonify({'message': 'Server busy, please retry shortly'})
+        response.status_code = 503
+        response.headers['Retry-After'] = '1'
+        return response
+
+    def _executor(self):
+        # A pool inherited across fork() has no live workers, so each
+        # process starts its own on first use
+        with self._lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context(START_METHOD))
+                self._pool_pid = os.getpid()
+            return self._pool
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+        try:
+            future = self._executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise PasswordHasherBusy()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        if not pwhash or password is None:
+            return False
+        return self._run(check_password_hash, pwhash, password)
+
+    def _method_prefix(self):
+        # Werkzeug stores methods expanded with their defaults ('pbkdf2' is
+        # written as 'pbkdf2:sha256:<iterations>'), so compare against the
+        # prefix of a real hash, made once (in the pool, since it costs a
+        # full key stretch), rather than the configured string
+        if self._prefix is None:
+            self._prefix = self.hash('').split('$', 1)[0]
+        return self._prefix
+
+    def needs_rehash(self, pwhash):
+        """True if ``pwhash`` was made with other parameters than ``method``"""
+        return pwhash.split('$', 1)[0] != self._method_prefix()
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None and self._pool_pid == os.getpid():
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,118 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """Checkout counters for one connection pool (per worker process)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.saturated = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.peak_checked_out = 0
+
+    def record(self, wait, saturated, checked_out, timed_out=False):
+        with self._lock:
+            self.checkouts += 1
+            self.saturated += saturated
+            self.timeouts += timed_out
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that times every checkout.
+
+    A checkout is saturated when every connection, overflow included, was
+    already in use, so the caller had to wait for one to be returned.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        self._checkout = threading.local()
+
+    def capacity(self):
+        """Connections the pool may open, or None when overflow is unbounded"""
+        return None if self._max_overflow < 0 else self.size() + self._max_overflow
+
+    def _do_get(self):
+        # QueuePool._do_get retries by calling itself; time the outer call only
+        if getattr(self._checkout, 'active', False):
+            return super()._do_get()
+
+        capacity = self.capacity()
+        saturated = capacity is not None and self.checkedout() >= capacity
+        self._checkout.active = True
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record(time.perf_counter() - started, saturated, self.checkedout(),
+                                timed_out=True)
+            raise
+        finally:
+            self._checkout.active = False
+        self.metrics.record(time.perf_counter() - started, saturated, self.checkedout())
+        return connection
+
+
+def pool_stats(pool):
+    """Current state and checkout metrics of a pool, as a dict"""
+    if not isinstance(pool, InstrumentedQueuePool):
+        return {'pool': type(pool).__name__, 'status': pool.status()}
+
+    metrics = pool.metrics
+    capacity = pool.capacity()
+    checked_out = pool.checkedout()
+    checkouts = metrics.checkouts
+    return {
+        'pool': type(pool).__name__,
+        'size': pool.size(),
+        'capacity': capacity,
+        'checked_out': checked_out,
+        'peak_checked_out': metrics.peak_checked_out,
+        'utilization': round(checked_out / capacity, 3) if capacity else None,
+        'checkouts': checkouts,
+        'saturated_checkouts': metrics.saturated,
+        'saturation': round(metrics.saturated / checkouts, 3) if checkouts else 0.0,
+        'timeouts': metrics.timeouts,
+        'wait_ms_avg': round(metrics.wait_total / checkouts * 1000, 3) if checkouts else 0.0,
+        'wait_ms_max': round(metrics.wait_max * 1000, 3)
+    }
+
+
+class PoolMonitor:
+    """Checkout wait time and saturation for the app's connection pools.
+
+    With ``SQL_POOL_METRICS`` (on by default) engines use
+    ``InstrumentedQueuePool`` unless ``SQLALCHEMY_ENGINE_OPTIONS`` names
+    another pool class; in-memory SQLite keeps its ``StaticPool``. Must be
+    initialized before Flask-SQLAlchemy creates the engines.
+    """
+
+    def __init__(self, app=None, db=None):
+        self.db = db
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db):
+        self.db = db
+        app.config.setdefault('SQL_POOL_METRICS', True)
+        app.extensions['pool_monitor'] = self
+        if app.config['SQL_POOL_METRICS']:
+            options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+            options.setdefault('poolclass', InstrumentedQueuePool)
+            app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+    def stats(self):
+        """Pool stats per engine (``default`` plus any binds) for this process"""
+        return {key or 'default': pool_stats(engine.pool)
+                for key, engine in self.db.engines.items()}
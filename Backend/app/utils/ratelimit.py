@@ -0,0 +1,201 @@
+import math
+import re
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, jsonify, request
+
+# Per-scope limits, as {key kind: 'N/period'}; override with RATELIMIT_RULES
+DEFAULT_RULES = {
+    'login': {'ip': '20/minute', 'email': '5/minute'},
+    'signup': {'ip': '5/minute', 'email': '3/hour'},
+}
+
+_PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+_RULE = re.compile(r'^\s*(\d+)\s*/\s*(second|minute|hour|day)s?\s*$')
+
+
+def parse_rule(rule):
+    """Parse ``'N/period'`` into a bucket ``(capacity, refill per second)``"""
+    match = _RULE.match(rule)
+    if not match:
+        raise ValueError(f'Invalid rate limit: {rule!r}')
+    capacity = int(match.group(1))
+    return capacity, capacity / _PERIODS[match.group(2)]
+
+
+def client_ip():
+    """The client's address, from X-Forwarded-For behind trusted proxies.
+
+    With ``RATELIMIT_TRUSTED_PROXIES = N`` the Nth address from the right is
+    used: each proxy appends the address it was connected from, and entries
+    further left could have been written by the client itself.
+    """
+    proxies = current_app.config.get('RATELIMIT_TRUSTED_PROXIES', 0)
+    if proxies:
+        forwarded = [addr.strip() for addr in request.headers.get('X-Forwarded-For', '').split(',')]
+        forwarded = [addr for addr in forwarded if addr]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.remote_addr
+
+
+def request_email():
+    data = request.get_json(silent=True)
+    email = data.get('email') if isinstance(data, dict) else None
+    if not isinstance(email, str) or not email.strip():
+        return None
+    return email.strip().lower()
+
+
+KEY_FUNCS = {'ip': client_ip, 'email': request_email}
+
+
+class MemoryBackend:
+    """Token buckets in a process-local dict.
+
+    A bucket that has refilled completely is equivalent to no bucket, so
+    each entry expires once it has been idle that long; every hit pushes the
+    expiry out again. Expired entries are swept at most once per
+    ``sweep_interval`` seconds.
+    """
+
+    def __init__(self, clock=time.monotonic, sweep_interval=60):
+        self._clock = clock
+        self._sweep_interval = sweep_interval
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._next_sweep = clock() + sweep_interval
+
+    def consume(self, key, capacity, rate, cost=1):
+        """Take ``cost`` tokens; return ``(allowed, retry_after_seconds)``"""
+        with self._lock:
+            now = self._clock()
+            if now >= self._next_sweep:
+                self._sweep(now)
+
+            tokens, stamp, _ = self._buckets.get(key, (capacity, now, None))
+            tokens = min(capacity, tokens + (now - stamp) * rate)
+            if tokens >= cost:
+                tokens -= cost
+                allowed, retry_after = True, 0.0
+            else:
+                allowed, retry_after = False, (cost - tokens) / rate
+
+            self._buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+            return allowed, retry_after
+
+    def _sweep(self, now):
+        expired = [key for key, (_, _, expires_at) in self._buckets.items() if expires_at <= now]
+        for key in expired:
+            del self._buckets[key]
+        self._next_sweep = now + self._sweep_interval
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class RedisBackend:
+    """Token buckets in Redis, shared by every worker.
+
+    The refill-and-take step runs as one Lua script on the server clock, so
+    concurrent workers cannot double-spend a bucket or disagree on time.
+    """
+
+    _SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local cost = tonumber(ARGV[3])
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'stamp')
+    local tokens = tonumber(state[1]) or capacity
+    local stamp = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - stamp) * rate)
+    local allowed = 0
+    local retry_after = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+        allowed = 1
+    else
+        retry_after = (cost - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'stamp', tostring(now))
+    redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+    return {allowed, tostring(retry_after)}
+    """
+
+    def __init__(self, url):
+        import redis  # optional dependency, only needed for shared limits
+
+        self._client = redis.Redis.from_url(url)
+        self._consume = self._client.register_script(self._SCRIPT)
+
+    def consume(self, key, capacity, rate, cost=1):
+        allowed, retry_after = self._consume(keys=[key], args=[capacity, rate, cost])
+        return bool(allowed), float(retry_after)
+
+
+def backend_from_url(url):
+    if not url or url.startswith('memory://'):
+        return MemoryBackend()
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisBackend(url)
+    raise ValueError(f'Unsupported RATELIMIT_STORAGE_URL: {url!r}')
+
+
+class RateLimiter:
+    """Token-bucket limits for expensive unauthenticated endpoints.
+
+    ``limit(scope)`` checks one bucket per key kind configured for the scope
+    (client IP, submitted email) before the view runs, so rejected requests
+    do no hashing or database work. Set ``RATELIMIT_STORAGE_URL`` to a Redis
+    URL to share buckets between workers.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = True
+        self.rules = {}
+        self.backend = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('RATELIMIT_ENABLED', True)
+        rules = {**DEFAULT_RULES, **app.config.get('RATELIMIT_RULES', {})}
+        self.rules = {scope: {kind: parse_rule(rule) for kind, rule in limits.items()}
+                      for scope, limits in rules.items()}
+        self.backend = backend_from_url(app.config.get('RATELIMIT_STORAGE_URL', 'memory://'))
+        app.extensions['rate_limiter'] = self
+
+    def check(self, scope):
+        """Consume a token from each of the scope's buckets.
+
+        Returns the seconds to wait before retrying, or None if allowed.
+        """
+        retry_after = None
+        for kind, (capacity, rate) in self.rules.get(scope, {}).items():
+            value = KEY_FUNCS[kind]()
+            if value is None:
+                continue
+            allowed, wait = self.backend.consume(f'rl:{scope}:{kind}:{value}', capacity, rate)
+            if not allowed:
+                retry_after = max(retry_after or 0, wait)
+        return retry_after
+
+    def limit(self, scope):
+        def wrapper(fn):
+            @wraps(fn)
+            def decorator(*args, **kwargs):
+                if self.enabled:
+                    retry_after = self.check(scope)
+                    if retry_after is not None:
+                        current_app.logger.warning('Rate limit hit for %s from %s', scope, client_ip())
+                        response = jsonify({'message': 'Too many attempts, please try again later'})
+                        response.status_code = 429
+                        response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+                        return response
+                return fn(*args, **kwargs)
+            return decorator
+        return wrapper
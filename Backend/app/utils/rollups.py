@@ -0,0 +1,88 @@
+from datetime import datetime, timezone
+
+from app import db
+from app.models.stats import DailyOrderStat, DailyUserStat, StatTotal
+from app.utils.upsert import dialect_insert
+
+
+def today():
+    # Timestamps are stored as naive UTC
+    return datetime.now(timezone.utc).date()
+
+
+def _add_to_totals(rows):
+    """Add ``(name, count, amount)`` rows to the running totals"""
+    stmt = dialect_insert(StatTotal).values([
+        {'name': name, 'count': count, 'amount': amount} for name, count, amount in rows
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['name'],
+        set_={
+            'count': StatTotal.count + stmt.excluded.count,
+            'amount': StatTotal.amount + stmt.excluded.amount,
+        }
+    )
+    db.session.execute(stmt)
+
+
+def _add_to_order_buckets(day, changes):
+    """Apply ``(status, count, revenue)`` changes to a day and the totals.
+
+    Each is one multi-row upsert, however many statuses change.
+    """
+    stmt = dialect_insert(DailyOrderStat).values([
+        {'day': day, 'status': status, 'order_count': count, 'revenue': revenue}
+        for status, count, revenue in changes
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['day', 'status'],
+        set_={
+            'order_count': DailyOrderStat.order_count + stmt.excluded.order_count,
+            'revenue': DailyOrderStat.revenue + stmt.excluded.revenue,
+        }
+    )
+    db.session.execute(stmt)
+    _add_to_totals([(f'orders:{status}', count, revenue) for status, count, revenue in changes])
+
+
+def _order_day(order):
+    # Both the creation and every status change of an order are counted on
+    # the day of its database-assigned created_at, so they always pair up
+    return order.created_at.date() if order.created_at else today()
+
+
+def record_order_created(order):
+    """Count a new order in the bucket of the day it was placed.
+
+    Flushes the session so the order has its ``created_at``.
+    """
+    db.session.flush()
+    _add_to_order_buckets(_order_day(order), [(order.status, 1, order.total_amount)])
+
+
+def record_status_change(order, old_status, new_status):
+    """Move an order between status buckets of the day it was placed"""
+    if old_status == new_status:
+        return
+    _add_to_order_buckets(_order_day(order), [
+        (old_status, -1, -order.total_amount),
+        (new_status, 1, order.total_amount),
+    ])
+
+
+def record_new_user():
+    stmt = dialect_insert(DailyUserStat).values(day=today(), new_users=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['day'],
+        set_={'new_users': DailyUserStat.new_users + stmt.excluded.new_users}
+    )
+    db.session.execute(stmt)
+    _add_to_totals([('users', 1, 0)])
+
+
+def record_product_created():
+    _add_to_totals([('products', 1, 0)])
+
+
+def record_product_deleted():
+    _add_to_totals([('products', -1, 0)])
@@ -0,0 +1,136 @@
+import re
+
+from sqlalchemy import DDL, column, event, select, text
+
+from app import db
+from app.models.product import Product
+
+# SQLite: external-content FTS5 table over product, kept in sync by triggers
+SQLITE_SEARCH_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS product_fts USING fts5(
+        name, description, category,
+        content='product', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS product_fts_ai AFTER INSERT ON product BEGIN
+        INSERT INTO product_fts(rowid, name, description, category)
+        VALUES (new.id, new.name, new.description, new.category);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS product_fts_ad AFTER DELETE ON product BEGIN
+        INSERT INTO product_fts(product_fts, rowid, name, description, category)
+        VALUES ('delete', old.id, old.name, old.description, old.category);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS product_fts_au AFTER UPDATE OF name, description, category ON product BEGIN
+        INSERT INTO product_fts(product_fts, rowid, name, description, category)
+        VALUES ('delete', old.id, old.name, old.description, old.category);
+        INSERT INTO product_fts(rowid, name, description, category)
+        VALUES (new.id, new.name, new.description, new.category);
+    END""",
+]
+
+# PostgreSQL: generated, weighted tsvector column behind a GIN index
+POSTGRES_SEARCH_DDL = [
+    """ALTER TABLE product ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(category, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'C')
+        ) STORED""",
+    'CREATE INDEX IF NOT EXISTS ix_product_search_vector ON product USING GIN (search_vector)',
+]
+
+# Created by the DDL above rather than the models, so autogenerate must not
+# treat them as stray schema (migrations/env.py filters them out)
+SEARCH_TABLE = 'product_fts'  # FTS5 also creates product_fts_data, _idx, ...
+SEARCH_COLUMNS = {('product', 'search_vector')}
+SEARCH_INDEXES = {'ix_product_search_vector'}
+
+
+def is_search_object(name, type_, table_name=None):
+    """True for a full-text search table, column or index from the DDL above"""
+    if type_ == 'table':
+        return name == SEARCH_TABLE or name.startswith(SEARCH_TABLE + '_')
+    if type_ == 'column':
+        return (table_name, name) in SEARCH_COLUMNS
+    if type_ == 'index':
+        return name in SEARCH_INDEXES
+    return False
+
+# bm25() column weights for (name, description, category)
+SQLITE_BM25_WEIGHTS = '10.0, 1.0, 5.0'
+
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(Product.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+for statement in POSTGRES_SEARCH_DDL:
+    event.listen(Product.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+event.listen(Product.__table__, 'before_drop',
+             DDL('DROP TABLE IF EXISTS product_fts').execute_if(dialect='sqlite'))
+
+_PRODUCT_COLUMNS = ', '.join(f'product.{c.name}' for c in Product.__table__.columns)
+
+
+def _dialect():
+    return db.session.get_bind().dialect.name
+
+
+def fts5_query(term):
+    """Quote each word of ``term`` as an FTS5 prefix query (implicit AND)"""
+    tokens = re.findall(r'\w+', term)
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def like_clause(term):
+    """Case-insensitive substring match on name and description"""
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    pattern = f'%{escaped}%'
+    return Product.name.ilike(pattern, escape='\\') | Product.description.ilike(pattern, escape='\\')
+
+
+def match_clause(term):
+    """Return a filter restricting ``Product`` to rows matching ``term``.
+
+    Uses the full-text index where the database has one and falls back to
+    a LIKE scan elsewhere.
+    """
+    dialect = _dialect()
+    if dialect == 'sqlite' and fts5_query(term):
+        matches = text('SELECT rowid FROM product_fts WHERE product_fts MATCH :fts_query') \
+            .bindparams(fts_query=fts5_query(term)).columns(column('rowid'))
+        return Product.id.in_(matches)
+    if dialect == 'postgresql':
+        return text("product.search_vector @@ websearch_to_tsquery('english', :ts_query)") \
+            .bindparams(ts_query=term)
+    return like_clause(term)
+
+
+def search_products(term, limit):
+    """Return up to ``limit`` products matching ``term``, best match first.
+
+    SQLite ranks with FTS5's BM25; PostgreSQL has no BM25 so it ranks with
+    ts_rank_cd over the weighted tsvector.
+    """
+    dialect = _dialect()
+    if dialect == 'sqlite':
+        query = fts5_query(term)
+        if not query:
+            return []
+        statement = text(
+            f'SELECT {_PRODUCT_COLUMNS} FROM product '
+            'JOIN product_fts ON product_fts.rowid = product.id '
+            'WHERE product_fts MATCH :query '
+            f'ORDER BY bm25(product_fts, {SQLITE_BM25_WEIGHTS}), product.id LIMIT :limit'
+        )
+        params = {'query': query, 'limit': limit}
+    elif dialect == 'postgresql':
+        statement = text(
+            f'SELECT {_PRODUCT_COLUMNS} FROM product, '
+            "websearch_to_tsquery('english', :query) AS query "
+            'WHERE product.search_vector @@ query '
+            'ORDER BY ts_rank_cd(product.search_vector, query) DESC, product.id LIMIT :limit'
+        )
+        params = {'query': term, 'limit': limit}
+    else:
+        return Product.query.filter(like_clause(term)) \
+            .order_by(Product.name, Product.id).limit(limit).all()
+
+    return db.session.execute(select(Product).from_statement(statement), params).scalars().all()
@@ -0,0 +1,22 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import db
+
+_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def dialect_insert(model):
+    """Return an INSERT for ``model`` that supports ``on_conflict_do_*``.
+
+    SQLite and PostgreSQL share the ON CONFLICT syntax, so callers can
+    build one upsert and run it on either database.
+    """
+    dialect = db.session.get_bind().dialect.name
+    try:
+        insert = _INSERTS[dialect]
+    except KeyError:
+        raise NotImplementedError(f'Upserts are not supported on {dialect}')
+    return insert(model)
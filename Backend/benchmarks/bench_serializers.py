@@ -0,0 +1,54 @@
+"""Compare marshmallow dumps with the compiled serializers.
+
+Builds transient orders in memory (no database needed), checks the compiled
+output is identical to ``schema.dump`` and times both.
+
+    python benchmarks/bench_serializers.py [orders] [items_per_order] [repeat]
+"""
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.order import Order, OrderItem
+from app.models.product import Product
+from app.schemas.order_schema import dump_order, dump_orders, order_schema, orders_schema
+
+
+def make_orders(count, items_per_order):
+    products = [Product(id=i, name=f'Product {i}', description='A product', price=9.99 + i,
+                        stock=100, image_url=f'https://example.com/{i}.jpg', category='misc')
+                for i in range(1, 21)]
+    orders = []
+    for i in range(1, count + 1):
+        order = Order(id=i, user_id=1, total_amount=0.0, status='pending',
+                      shipping_address='1 Example Street, Nairobi',
+                      created_at=datetime(2024, 1, 1, 12, 0, i % 60))
+        for j in range(items_per_order):
+            product = products[(i + j) % len(products)]
+            order.items.append(OrderItem(id=i * 100 + j, order_id=i, product_id=product.id,
+                                         product=product, quantity=j + 1, price=product.price))
+        order.total_amount = sum(item.quantity * item.price for item in order.items)
+        orders.append(order)
+    return orders
+
+
+def main():
+    args = [int(arg) for arg in sys.argv[1:4]]
+    count, items_per_order, repeat = args + [100, 5, 20][len(args):]
+    orders = make_orders(count, items_per_order)
+
+    assert dump_orders(orders) == orders_schema.dump(orders)
+    assert dump_order(orders[0]) == order_schema.dump(orders[0])
+
+    marshmallow = min(timeit.repeat(lambda: orders_schema.dump(orders), number=1, repeat=repeat))
+    compiled = min(timeit.repeat(lambda: dump_orders(orders), number=1, repeat=repeat))
+    print(f'{count} orders x {items_per_order} items, best of {repeat}')
+    print(f'  marshmallow  {marshmallow * 1000:8.2f} ms')
+    print(f'  compiled     {compiled * 1000:8.2f} ms  ({marshmallow / compiled:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
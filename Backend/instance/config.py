@@ -1,21 +1,86 @@
 import os
 
-class DevelopmentConfig:
+class Config:
+    """Defaults shared by every environment; used when APP_ENV is not set"""
+    SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///ecommerce.db'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-change-in-production'
+    JWT_ACCESS_TOKEN_EXPIRES = 3600  # 1 hour in seconds
+    CATALOG_CACHE_SIZE = 1024  # cached catalog reads per worker
+    CATALOG_CACHE_TTL = 60  # seconds an unchanged entry is kept
+    CATALOG_VERSION_STORE = 'database'  # shared by workers; 'memory' for a single process
+    CATALOG_MAX_AGE = 60  # Cache-Control max-age for catalog responses
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:600000'  # older hashes are upgraded on login
+    PASSWORD_HASH_WORKERS = 2  # hashing processes per worker; 0 hashes inline
+    PASSWORD_HASH_MAX_PENDING = 32  # queued hashes before login/signup return 503
+    RATELIMIT_ENABLED = True
+    RATELIMIT_STORAGE_URL = os.environ.get('RATELIMIT_STORAGE_URL') or 'memory://'  # redis:// to share across workers
+    RATELIMIT_TRUSTED_PROXIES = 0  # proxies in front of the app; client IPs come from X-Forwarded-For
+    SQL_QUERY_BUDGET = None  # statements per request before a warning; see @query_budget
+    SQL_POOL_METRICS = True  # time pool checkouts; see /api/admin/db/pool
+    IDEMPOTENCY_KEY_TTL = 86400  # seconds a stored order response can be replayed
+    IDEMPOTENCY_LOCK_TIMEOUT = 60  # seconds before a retry takes over an unfinished request; keep above SERVER_TIMEOUT
+    COMPRESS_MIN_SIZE = 500  # bytes; smaller responses are sent uncompressed
+    COMPRESS_LEVEL = 6  # gzip level, 1-9
+    COMPRESS_BR_LEVEL = 4  # brotli quality, 0-11; used when brotli is installed
+
+class DevelopmentConfig(Config):
     DEBUG = True
     TESTING = False
     SECRET_KEY = 'dev-secret-key'
     SQLALCHEMY_DATABASE_URI = 'sqlite:///ecommerce_dev.db'
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': 5,
+        'max_overflow': 5,
+        'pool_timeout': 10,  # fail fast so leaked connections show up
+        'pool_recycle': 3600
+    }
     JWT_SECRET_KEY = 'jwt-dev-secret-key'
+    SERVER_BIND = '127.0.0.1:5000'
+    SERVER_WORKERS = 1
+    SERVER_THREADS = 1
+    SERVER_PRELOAD = False
 
-class ProductionConfig:
+class ProductionConfig(Config):
     DEBUG = False
     TESTING = False
     SECRET_KEY = os.environ.get('SECRET_KEY')
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY')
+    SERVER_BIND = os.environ.get('BIND') or '0.0.0.0:8000'
+    SERVER_WORKERS = int(os.environ.get('WEB_CONCURRENCY') or (os.cpu_count() or 1) * 2 + 1)
+    SERVER_THREADS = int(os.environ.get('SERVER_THREADS') or 4)  # > 1 uses gunicorn's gthread worker
+    SERVER_PRELOAD = True  # import the app once in the master; workers share it copy-on-write
+    SERVER_TIMEOUT = 30  # seconds before a silent worker is restarted
+    RATELIMIT_TRUSTED_PROXIES = int(os.environ.get('TRUSTED_PROXIES') or 1)  # the load balancer
+    # Pools are per worker: the database sees up to
+    # SERVER_WORKERS * (pool_size + max_overflow) connections
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE') or SERVER_THREADS),  # one per request thread
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW') or 2),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT') or 10),
+        'pool_pre_ping': True,  # replace connections dropped by the server or a proxy
+        'pool_recycle': 1800  # below typical server/proxy idle timeouts
+    }
 
-class TestingConfig:
+class TestingConfig(Config):
     TESTING = True
     SECRET_KEY = 'test-secret-key'
     SQLALCHEMY_DATABASE_URI = 'sqlite:///ecommerce_test.db'
-    JWT_SECRET_KEY = 'jwt-test-secret-key'
\ No newline at end of file
+    JWT_SECRET_KEY = 'jwt-test-secret-key'
+
+config_by_name = {
+    'development': DevelopmentConfig,
+    'production': ProductionConfig,
+    'testing': TestingConfig
+}
+
+def get_config(name=None):
+    """Config class for an environment name, or the shared defaults for None"""
+    if not name:
+        return Config
+    if name not in config_by_name:
+        raise ValueError(f'Unknown environment {name!r}. Choose from: {", ".join(config_by_name)}')
+    return config_by_name[name]
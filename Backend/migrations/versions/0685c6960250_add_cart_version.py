@@ -0,0 +1,24 @@
+"""Add cart version
+
+Revision ID: 0685c6960250
+Revises: f296fa979b9c
+Create Date: 2026-10-18 21:47:26.118590
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0685c6960250'
+down_revision = 'f296fa979b9c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('cart', sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    op.drop_column('cart', 'version')
@@ -0,0 +1,45 @@
+"""Add stat totals
+
+Revision ID: 11d3a78c96d6
+Revises: 3e0e0925694f
+Create Date: 2026-10-18 21:29:44.063045
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '11d3a78c96d6'
+down_revision = '3e0e0925694f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('stat_total',
+    sa.Column('name', sa.String(length=40), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    # Seed the totals from existing rows
+    op.execute("""
+        INSERT INTO stat_total (name, count, amount)
+        SELECT 'orders:' || COALESCE(status, 'pending'), COUNT(*), SUM(total_amount)
+        FROM "order"
+        GROUP BY COALESCE(status, 'pending')
+    """)
+    op.execute("""
+        INSERT INTO stat_total (name, count, amount)
+        SELECT 'users', COUNT(*), 0 FROM "user"
+    """)
+    op.execute("""
+        INSERT INTO stat_total (name, count, amount)
+        SELECT 'products', COUNT(*), 0 FROM product
+    """)
+
+
+def downgrade():
+    op.drop_table('stat_total')
@@ -0,0 +1,51 @@
+"""Add daily stat rollups
+
+Revision ID: 2f6c00d670e5
+Revises: e22fd7167164
+Create Date: 2026-10-18 16:52:33.918402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2f6c00d670e5'
+down_revision = 'e22fd7167164'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_order_stat',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'status')
+    )
+    op.create_table('daily_user_stat',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('new_users', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day')
+    )
+
+    # Seed the rollups from existing history
+    day = 'date(created_at)' if op.get_bind().dialect.name == 'sqlite' else 'CAST(created_at AS DATE)'
+    op.execute(f"""
+        INSERT INTO daily_order_stat (day, status, order_count, revenue)
+        SELECT {day}, COALESCE(status, 'pending'), COUNT(*), SUM(total_amount)
+        FROM "order" WHERE created_at IS NOT NULL
+        GROUP BY {day}, COALESCE(status, 'pending')
+    """)
+    op.execute(f"""
+        INSERT INTO daily_user_stat (day, new_users)
+        SELECT {day}, COUNT(*)
+        FROM "user" WHERE created_at IS NOT NULL
+        GROUP BY {day}
+    """)
+
+
+def downgrade():
+    op.drop_table('daily_user_stat')
+    op.drop_table('daily_order_stat')
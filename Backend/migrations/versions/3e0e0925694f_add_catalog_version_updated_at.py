@@ -0,0 +1,24 @@
+"""Add catalog version updated_at
+
+Revision ID: 3e0e0925694f
+Revises: a441ba6830dd
+Create Date: 2026-10-18 21:27:12.607631
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e0e0925694f'
+down_revision = 'a441ba6830dd'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('catalog_version', sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('catalog_version', 'updated_at')
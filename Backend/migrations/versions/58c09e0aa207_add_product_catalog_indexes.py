@@ -0,0 +1,30 @@
+"""Add product catalog indexes
+
+Revision ID: 58c09e0aa207
+Revises: e8a1a61bac5d
+Create Date: 2026-10-18 09:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '58c09e0aa207'
+down_revision = 'e8a1a61bac5d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('product', schema=None) as batch_op:
+        batch_op.create_index('ix_product_name_id', ['name', 'id'], unique=False)
+        batch_op.create_index('ix_product_price_id', ['price', 'id'], unique=False)
+        batch_op.create_index('ix_product_category_price_id', ['category', 'price', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('product', schema=None) as batch_op:
+        batch_op.drop_index('ix_product_category_price_id')
+        batch_op.drop_index('ix_product_price_id')
+        batch_op.drop_index('ix_product_name_id')
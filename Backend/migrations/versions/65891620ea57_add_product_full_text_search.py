@@ -0,0 +1,76 @@
+"""Add product full-text search
+
+Revision ID: 65891620ea57
+Revises: 58c09e0aa207
+Create Date: 2026-10-18 11:04:27.552918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '65891620ea57'
+down_revision = '58c09e0aa207'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        op.execute("""
+            CREATE VIRTUAL TABLE product_fts USING fts5(
+                name, description, category,
+                content='product', content_rowid='id',
+                tokenize='porter unicode61 remove_diacritics 2'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER product_fts_ai AFTER INSERT ON product BEGIN
+                INSERT INTO product_fts(rowid, name, description, category)
+                VALUES (new.id, new.name, new.description, new.category);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER product_fts_ad AFTER DELETE ON product BEGIN
+                INSERT INTO product_fts(product_fts, rowid, name, description, category)
+                VALUES ('delete', old.id, old.name, old.description, old.category);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER product_fts_au AFTER UPDATE OF name, description, category ON product BEGIN
+                INSERT INTO product_fts(product_fts, rowid, name, description, category)
+                VALUES ('delete', old.id, old.name, old.description, old.category);
+                INSERT INTO product_fts(rowid, name, description, category)
+                VALUES (new.id, new.name, new.description, new.category);
+            END
+        """)
+        # Index the rows that already exist
+        op.execute("INSERT INTO product_fts(product_fts) VALUES ('rebuild')")
+
+    elif dialect == 'postgresql':
+        op.execute("""
+            ALTER TABLE product ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(category, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(description, '')), 'C')
+            ) STORED
+        """)
+        op.execute('CREATE INDEX ix_product_search_vector ON product USING GIN (search_vector)')
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS product_fts_au')
+        op.execute('DROP TRIGGER IF EXISTS product_fts_ad')
+        op.execute('DROP TRIGGER IF EXISTS product_fts_ai')
+        op.execute('DROP TABLE IF EXISTS product_fts')
+
+    elif dialect == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_product_search_vector')
+        op.execute('ALTER TABLE product DROP COLUMN IF EXISTS search_vector')
@@ -0,0 +1,29 @@
+"""Add catalog version
+
+Revision ID: a441ba6830dd
+Revises: 81615926175a
+Create Date: 2026-10-19 10:04:18.527114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a441ba6830dd'
+down_revision = '81615926175a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    catalog_version = op.create_table('catalog_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(catalog_version, [{'id': 1, 'version': 0}])
+
+
+def downgrade():
+    op.drop_table('catalog_version')
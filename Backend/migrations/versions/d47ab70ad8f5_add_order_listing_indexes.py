@@ -0,0 +1,28 @@
+"""Add order listing indexes
+
+Revision ID: d47ab70ad8f5
+Revises: e66b29d2eaa3
+Create Date: 2026-10-18 14:48:52.731460
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd47ab70ad8f5'
+down_revision = 'e66b29d2eaa3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_order_created_at_id', 'order', ['created_at', 'id'], unique=False)
+    op.create_index('ix_order_user_id_created_at_id', 'order', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_order_status_created_at_id', 'order', ['status', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_order_status_created_at_id', table_name='order')
+    op.drop_index('ix_order_user_id_created_at_id', table_name='order')
+    op.drop_index('ix_order_created_at_id', table_name='order')
@@ -0,0 +1,24 @@
+"""Index order_item.order_id
+
+Revision ID: e22fd7167164
+Revises: d47ab70ad8f5
+Create Date: 2026-10-18 15:36:10.284617
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e22fd7167164'
+down_revision = 'd47ab70ad8f5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f('ix_order_item_order_id'), 'order_item', ['order_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_order_item_order_id'), table_name='order_item')
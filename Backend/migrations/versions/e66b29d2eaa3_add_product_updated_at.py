@@ -0,0 +1,27 @@
+"""Add product updated_at
+
+Revision ID: e66b29d2eaa3
+Revises: 65891620ea57
+Create Date: 2026-10-18 13:27:05.104736
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e66b29d2eaa3'
+down_revision = '65891620ea57'
+branch_labels = None
+depends_on = None
+
+
+# Plain ALTER TABLE rather than batch mode: a batch rebuild of product on
+# SQLite would silently drop the product_fts sync triggers.
+def upgrade():
+    op.add_column('product', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute('UPDATE product SET updated_at = created_at')
+
+
+def downgrade():
+    op.drop_column('product', 'updated_at')
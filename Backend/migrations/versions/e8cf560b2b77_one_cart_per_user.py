@@ -0,0 +1,35 @@
+"""One cart per user
+
+Revision ID: e8cf560b2b77
+Revises: 8852f5478066
+Create Date: 2026-10-18 21:02:41.586203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8cf560b2b77'
+down_revision = '8852f5478066'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Fold any duplicate carts into each user's oldest cart before the
+    # unique index is created
+    op.execute("""
+        UPDATE cart_item SET cart_id = (
+            SELECT MIN(other.id) FROM cart
+            JOIN cart AS other ON other.user_id = cart.user_id
+            WHERE cart.id = cart_item.cart_id
+        )
+        WHERE cart_id NOT IN (SELECT MIN(id) FROM cart GROUP BY user_id)
+    """)
+    op.execute("DELETE FROM cart WHERE id NOT IN (SELECT MIN(id) FROM cart GROUP BY user_id)")
+    op.create_index('ix_cart_user_id', 'cart', ['user_id'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_cart_user_id', table_name='cart')
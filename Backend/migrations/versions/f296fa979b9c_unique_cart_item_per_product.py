@@ -0,0 +1,39 @@
+"""Unique cart item per product
+
+Revision ID: f296fa979b9c
+Revises: e8cf560b2b77
+Create Date: 2026-10-18 21:18:09.742815
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f296fa979b9c'
+down_revision = 'e8cf560b2b77'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Merge duplicate lines into the oldest one before the unique index is
+    # created
+    op.execute("""
+        UPDATE cart_item SET quantity = (
+            SELECT SUM(other.quantity) FROM cart_item AS other
+            WHERE other.cart_id = cart_item.cart_id AND other.product_id = cart_item.product_id
+        )
+        WHERE id IN (
+            SELECT MIN(id) FROM cart_item GROUP BY cart_id, product_id HAVING COUNT(*) > 1
+        )
+    """)
+    op.execute("""
+        DELETE FROM cart_item
+        WHERE id NOT IN (SELECT MIN(id) FROM cart_item GROUP BY cart_id, product_id)
+    """)
+    op.create_index('ix_cart_item_cart_id_product_id', 'cart_item', ['cart_id', 'product_id'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_cart_item_cart_id_product_id', table_name='cart_item')
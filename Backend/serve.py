@@ -0,0 +1,58 @@
+"""Production entry point: serves the API with gunicorn.
+
+    APP_ENV=production python serve.py
+
+Workers, threads, bind address and preloading come from the config class
+selected by ``APP_ENV`` in ``instance/config.py``. ``run.py`` remains the
+single-process development server.
+"""
+import os
+
+from gunicorn.app.base import BaseApplication
+
+from app import create_app, db
+from instance.config import get_config
+
+
+def post_fork(server, worker):
+    """Drop connections inherited from the master.
+
+    With preloading the app, and any pooled connection it opened, exists
+    before the fork. Sharing one socket between processes corrupts it, so
+    each worker discards its copy of the pool (without closing the master's
+    connections) and opens its own on first use.
+    """
+    app = worker.app.wsgi()
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+class Server(BaseApplication):
+    def __init__(self, config_class):
+        self.config_class = config_class
+        super().__init__()
+
+    def load_config(self):
+        config = self.config_class
+        settings = {
+            'bind': getattr(config, 'SERVER_BIND', '0.0.0.0:8000'),
+            'workers': getattr(config, 'SERVER_WORKERS', 1),
+            'threads': getattr(config, 'SERVER_THREADS', 1),
+            'preload_app': getattr(config, 'SERVER_PRELOAD', True),
+            'timeout': getattr(config, 'SERVER_TIMEOUT', 30),
+            'post_fork': post_fork,
+        }
+        for key, value in settings.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return create_app(self.config_class)
+
+
+if __name__ == '__main__':
+    try:
+        config_class = get_config(os.environ.get('APP_ENV', 'production'))
+    except ValueError as e:
+        raise SystemExit(str(e))
+    Server(config_class).run()
@@ -0,0 +1,60 @@
+import pytest
+
+from app import create_app, db
+from app import models  # noqa: F401  registers every table
+from instance.config import TestingConfig
+
+
+@pytest.fixture
+def app(tmp_path):
+    class Config(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "test.db"}'
+        JWT_SECRET_KEY = 'jwt-test-secret-key-at-least-32-bytes'
+        JWT_VERIFY_SUB = False  # identities are user ids (ints)
+        PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+        PASSWORD_HASH_WORKERS = 0  # hash inline, no process pool
+        RATELIMIT_ENABLED = False
+        SQL_INSTRUMENTATION = True
+        SQL_QUERY_BUDGET_RAISE = True
+
+    app = create_app(Config)
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def _signup(client, username, email):
+    response = client.post('/api/auth/signup', json={
+        'username': username, 'email': email, 'password': 'secret123'
+    })
+    assert response.status_code == 201, response.get_json()
+    return {'Authorization': 'Bearer ' + response.get_json()['access_token']}
+
+
+@pytest.fixture
+def admin_headers(client):
+    return _signup(client, 'admin', 'admin@example.com')
+
+
+@pytest.fixture
+def user_headers(client):
+    return _signup(client, 'shopper', 'shopper@example.com')
+
+
+@pytest.fixture
+def products(client, admin_headers):
+    ids = []
+    for i in range(3):
+        response = client.post('/api/products', json={
+            'name': f'Product {i}', 'price': 10 + i, 'stock': 5, 'category': 'misc'
+        }, headers=admin_headers)
+        assert response.status_code == 201, response.get_json()
+        ids.append(response.get_json()['id'])
+    return ids
@@ -0,0 +1,48 @@
+from app import db
+from app.models.product import Product
+from app.utils.cache import CatalogCache
+
+
+def _other_worker_cache(app):
+    """A catalog cache as another worker process would have it"""
+    cache = CatalogCache()
+    extensions = dict(app.extensions)
+    cache.init_app(app)
+    app.extensions.clear()
+    app.extensions.update(extensions)
+    return cache
+
+
+def test_edit_invalidates_other_workers(app, client, admin_headers, products):
+    product_id = products[0]
+    loads = []
+
+    def load():
+        loads.append(product_id)
+        return db.session.get(Product, product_id).price
+
+    with app.app_context():
+        other = _other_worker_cache(app)
+        assert other.get_or_load(('product', product_id), load) == 10
+        assert other.get_or_load(('product', product_id), load) == 10
+    assert len(loads) == 1
+
+    response = client.put(f'/api/products/{product_id}', json={'price': 12.5},
+                          headers=admin_headers)
+    assert response.status_code == 200
+
+    with app.app_context():
+        assert other.get_or_load(('product', product_id), load) == 12.5
+    assert len(loads) == 2
+
+
+def test_catalog_reads_see_checkout_stock(client, user_headers, products):
+    product_id = products[0]
+    assert client.get(f'/api/products/{product_id}').get_json()['stock'] == 5
+
+    client.post('/api/cart', json={'product_id': product_id, 'quantity': 2}, headers=user_headers)
+    response = client.post('/api/orders', json={'shipping_address': '123 Main Street'},
+                           headers=user_headers)
+    assert response.status_code == 201
+
+    assert client.get(f'/api/products/{product_id}').get_json()['stock'] == 3
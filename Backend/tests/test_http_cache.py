@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from app import db
+from app.models.catalog import CatalogVersion
+
+
+def _backdate_catalog(app, seconds=60):
+    with app.app_context():
+        row = db.session.get(CatalogVersion, 1)
+        row.updated_at -= timedelta(seconds=seconds)
+        db.session.commit()
+
+
+def test_delete_moves_list_last_modified(app, client, admin_headers, products):
+    _backdate_catalog(app)
+    last_modified = client.get('/api/products').headers['Last-Modified']
+    response = client.get('/api/products', headers={'If-Modified-Since': last_modified})
+    assert response.status_code == 304
+
+    client.delete(f'/api/products/{products[1]}', headers=admin_headers)
+
+    response = client.get('/api/products', headers={'If-Modified-Since': last_modified})
+    assert response.status_code == 200
+    assert [product['id'] for product in response.get_json()['products']] == [products[0], products[2]]
+    # Changed within the current second: not yet usable as a validator
+    assert 'Last-Modified' not in response.headers
@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from app import db
+from app.models.idempotency import IdempotencyKey
+from app.models.user import User
+from app.utils.idempotency import _now, _request_hash
+
+ORDER = {'shipping_address': '123 Main Street'}
+
+
+def _with_key(headers, key):
+    return dict(headers, **{'Idempotency-Key': key})
+
+
+def _orders(client, headers):
+    return client.get('/api/orders', headers=headers).get_json()['orders']
+
+
+def _abandoned_reservation(app, key, age):
+    """A reservation left by a worker that died before finishing the order"""
+    with app.test_request_context('/api/orders', method='POST', json=ORDER):
+        request_hash = _request_hash()
+    with app.app_context():
+        user = User.query.filter_by(email='shopper@example.com').one()
+        db.session.add(IdempotencyKey(user_id=user.id, key=key, request_hash=request_hash,
+                                      created_at=_now() - age))
+        db.session.commit()
+
+
+def test_retry_replays_first_response(client, user_headers, products):
+    client.post('/api/cart', json={'product_id': products[0], 'quantity': 1}, headers=user_headers)
+    headers = _with_key(user_headers, 'checkout-1')
+
+    first = client.post('/api/orders', json=ORDER, headers=headers)
+    assert first.status_code == 201
+    assert 'Idempotent-Replayed' not in first.headers
+
+    retry = client.post('/api/orders', json=ORDER, headers=headers)
+    assert retry.status_code == 201
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert retry.get_json() == first.get_json()
+    assert len(_orders(client, user_headers)) == 1
+
+
+def test_key_reused_for_other_request_conflicts(client, user_headers, products):
+    client.post('/api/cart', json={'product_id': products[0], 'quantity': 1}, headers=user_headers)
+    headers = _with_key(user_headers, 'checkout-1')
+    assert client.post('/api/orders', json=ORDER, headers=headers).status_code == 201
+
+    response = client.post('/api/orders', json={'shipping_address': '9 Other Road'}, headers=headers)
+    assert response.status_code == 422
+    assert len(_orders(client, user_headers)) == 1
+
+
+def test_failed_request_releases_key(client, user_headers, products):
+    headers = _with_key(user_headers, 'checkout-1')
+    # Empty cart: the order fails and the key must not be kept
+    assert client.post('/api/orders', json=ORDER, headers=headers).status_code == 400
+
+    client.post('/api/cart', json={'product_id': products[0], 'quantity': 1}, headers=user_headers)
+    response = client.post('/api/orders', json=ORDER, headers=headers)
+    assert response.status_code == 201
+    assert 'Idempotent-Replayed' not in response.headers
+
+
+def test_retry_takes_over_abandoned_reservation(app, client, user_headers, products):
+    client.post('/api/cart', json={'product_id': products[0], 'quantity': 1}, headers=user_headers)
+    _abandoned_reservation(app, 'fresh', timedelta(seconds=1))
+    _abandoned_reservation(app, 'stale', timedelta(seconds=app.config['IDEMPOTENCY_LOCK_TIMEOUT'] + 1))
+
+    response = client.post('/api/orders', json=ORDER, headers=_with_key(user_headers, 'fresh'))
+    assert response.status_code == 409
+
+    response = client.post('/api/orders', json=ORDER, headers=_with_key(user_headers, 'stale'))
+    assert response.status_code == 201
+    replayed = client.post('/api/orders', json=ORDER, headers=_with_key(user_headers, 'stale'))
+    assert replayed.headers['Idempotent-Replayed'] == 'true'
+    assert replayed.get_json() == response.get_json()
@@ -0,0 +1,39 @@
+import pytest
+
+from app import db
+from app.models.product import Product
+from app.utils.inventory import InsufficientStock, reserve_stock
+
+
+def _stock(client, product_id):
+    return client.get(f'/api/products/{product_id}').get_json()['stock']
+
+
+def test_checkout_short_on_one_line_reserves_nothing(client, admin_headers, user_headers, products):
+    client.post('/api/cart', json={'product_id': products[0], 'quantity': 2}, headers=user_headers)
+    client.post('/api/cart', json={'product_id': products[1], 'quantity': 3}, headers=user_headers)
+    # Stock drops after the items went into the cart
+    client.put(f'/api/products/{products[1]}', json={'stock': 2}, headers=admin_headers)
+
+    response = client.post('/api/orders', json={'shipping_address': '123 Main Street'},
+                           headers=user_headers)
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Insufficient stock for Product 1. Available: 2, Requested: 3'
+
+    assert _stock(client, products[0]) == 5
+    assert _stock(client, products[1]) == 2
+    assert len(client.get('/api/cart', headers=user_headers).get_json()['items']) == 2
+    assert client.get('/api/orders', headers=user_headers).get_json()['orders'] == []
+
+
+def test_reserve_stock_exact_and_short(app, products):
+    with app.app_context():
+        reserve_stock({products[0]: 5, products[1]: 1})
+        db.session.commit()
+        assert db.session.get(Product, products[0]).stock == 0
+        assert db.session.get(Product, products[1]).stock == 4
+
+        with pytest.raises(InsufficientStock):
+            reserve_stock({products[0]: 1, products[2]: 1})
+        db.session.rollback()
+        assert db.session.get(Product, products[2]).stock == 5
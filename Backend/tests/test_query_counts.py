@@ -0,0 +1,70 @@
+"""Statements per request on the write paths, from the X-DB-Queries header.
+
+A failure here means an endpoint started running more (or fewer) queries;
+check for a lazy load or a reload after commit before raising the count.
+"""
+
+
+def queries(response):
+    return int(response.headers['X-DB-Queries'])
+
+
+def test_update_product(client, admin_headers, products):
+    response = client.put(f'/api/products/{products[0]}', json={'price': 9.5},
+                          headers=admin_headers)
+    assert response.status_code == 200
+    assert response.get_json()['price'] == 9.5
+    # Load, update, catalog version bump
+    assert queries(response) == 3
+
+
+def test_add_to_cart(client, user_headers, products):
+    response = client.post('/api/cart', json={'product_id': products[0], 'quantity': 2},
+                           headers=user_headers)
+    assert response.status_code == 200
+
+    response = client.post('/api/cart', json={'product_id': products[1], 'quantity': 1},
+                           headers=user_headers)
+    assert response.status_code == 200
+    assert len(response.get_json()['items']) == 2
+    assert queries(response) == 3
+
+
+def test_update_cart_item(client, user_headers, products):
+    response = client.post('/api/cart', json={'product_id': products[0], 'quantity': 1},
+                           headers=user_headers)
+    item_id = response.get_json()['items'][0]['id']
+
+    response = client.put(f'/api/cart/{item_id}', json={'quantity': 3}, headers=user_headers)
+    assert response.status_code == 200
+    assert response.get_json()['items'][0]['quantity'] == 3
+    assert queries(response) == 3
+
+
+def test_create_order(client, user_headers, products):
+    for product_id in products:
+        client.post('/api/cart', json={'product_id': product_id, 'quantity': 1},
+                    headers=user_headers)
+
+    response = client.post('/api/orders', json={'shipping_address': '123 Main Street'},
+                           headers=user_headers)
+    assert response.status_code == 201
+    assert len(response.get_json()['items']) == 3
+    # Cart load, stock reservation, order insert, daily and total stats
+    # upserts, cart clear, cart and catalog version bumps; SQLite then inserts
+    # order items one row at a time (INSERT .. RETURNING), where PostgreSQL
+    # batches them
+    assert queries(response) == 8 + len(products)
+
+
+def test_read_paths_stay_within_budget(client, user_headers, products):
+    client.post('/api/cart', json={'product_id': products[0], 'quantity': 1},
+                headers=user_headers)
+    client.post('/api/orders', json={'shipping_address': '123 Main Street'},
+                headers=user_headers)
+
+    # SQL_QUERY_BUDGET_RAISE turns an over-budget view into an error
+    for url in ('/api/products', f'/api/products/{products[0]}', '/api/cart',
+                '/api/orders', '/api/orders/1'):
+        response = client.get(url, headers=user_headers)
+        assert response.status_code == 200, url
@@ -0,0 +1,52 @@
+import pytest
+
+from app.utils.ratelimit import parse_rule
+
+
+@pytest.fixture
+def limiter(app):
+    limiter = app.extensions['rate_limiter']
+    limiter.enabled = True
+    limiter.rules = {
+        'login': {'ip': parse_rule('2/minute')},
+        'signup': {'ip': parse_rule('10/minute'), 'email': parse_rule('1/hour')},
+    }
+    return limiter
+
+
+def _login(client, email, forwarded_for=None):
+    headers = {'X-Forwarded-For': forwarded_for} if forwarded_for else {}
+    return client.post('/api/auth/login', json={'email': email, 'password': 'wrong'},
+                       headers=headers)
+
+
+def test_login_over_limit_gets_429(client, limiter):
+    for i in range(2):
+        assert _login(client, f'a{i}@example.com').status_code == 401
+
+    response = _login(client, 'a2@example.com')
+    assert response.status_code == 429
+    assert 1 <= int(response.headers['Retry-After']) <= 30
+
+
+def test_signup_limited_per_email(client, limiter):
+    def signup(username, email):
+        return client.post('/api/auth/signup', json={
+            'username': username, 'email': email, 'password': 'secret123'
+        })
+
+    assert signup('first', 'same@example.com').status_code == 201
+    # Rejected by the email bucket before the duplicate check runs
+    assert signup('second', 'Same@Example.com').status_code == 429
+    assert signup('third', 'other@example.com').status_code == 201
+
+
+def test_clients_behind_proxy_get_their_own_buckets(app, client, limiter):
+    app.config['RATELIMIT_TRUSTED_PROXIES'] = 1
+
+    for i in range(2):
+        assert _login(client, f'a{i}@example.com', '203.0.113.1').status_code == 401
+    assert _login(client, 'a2@example.com', '203.0.113.1').status_code == 429
+    assert _login(client, 'b@example.com', '203.0.113.2').status_code == 401
+    # Only the address the trusted proxy appended counts, not what the client sent
+    assert _login(client, 'c@example.com', '198.51.100.7, 203.0.113.1').status_code == 429
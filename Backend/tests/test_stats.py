@@ -0,0 +1,17 @@
+def test_totals_follow_orders_and_products(client, admin_headers, user_headers, products):
+    client.post('/api/cart', json={'product_id': products[0], 'quantity': 2}, headers=user_headers)
+    order = client.post('/api/orders', json={'shipping_address': '123 Main Street'},
+                        headers=user_headers).get_json()
+    client.post('/api/cart', json={'product_id': products[1], 'quantity': 1}, headers=user_headers)
+    client.post('/api/orders', json={'shipping_address': '123 Main Street'}, headers=user_headers)
+    client.post(f'/api/orders/{order["id"]}/cancel', headers=user_headers)
+    client.delete(f'/api/products/{products[2]}', headers=admin_headers)
+
+    stats = client.get('/api/admin/stats', headers=admin_headers).get_json()
+    assert stats['total_orders'] == 2
+    assert stats['total_revenue'] == 11
+    assert stats['total_customers'] == 2
+    assert stats['total_products'] == 2
+    assert stats['orders_by_status'] == {'pending': 1, 'cancelled': 1}
+    # Creation and cancellation land in the same day's buckets
+    assert [day['orders'] for day in stats['daily']] == [2]
@@ -85,6 +85,20 @@ export const CartProvider = ({ children }) => {
     }
   };
 
+  // Apply several add/set/remove operations in one request, e.g. to sync a
+  // cart built before login: [{ op: 'add', product_id, quantity }, ...]
+  const applyCartOperations = async (operations) => {
+    try {
+      const response = await cartAPI.patch(operations);
+      dispatch({ type: 'SET_CART', payload: response.data });
+      return { success: true };
+    } catch (error) {
+      const message = error.response?.data?.message || 'Failed to update cart';
+      toast.error(message);
+      return { success: false, error: message };
+    }
+  };
+
   const clearCart = async () => {
     try {
       await cartAPI.clear();
@@ -115,6 +129,7 @@ export const CartProvider = ({ children }) => {
     addToCart,
     updateCartItem,
     removeFromCart,
+    applyCartOperations,
     clearCart,
     refreshCart: fetchCart,
   };
@@ -4,10 +4,16 @@ import { toast } from 'react-hot-toast';
 
 const ProductContext = createContext();
 
+export const PAGE_SIZE = 50;
+
 const productReducer = (state, action) => {
   switch (action.type) {
     case 'SET_PRODUCTS':
       return { ...state, products: action.payload, loading: false };
+    case 'APPEND_PRODUCTS':
+      return { ...state, products: [...state.products, ...action.payload], loading: false };
+    case 'SET_NEXT_CURSOR':
+      return { ...state, nextCursor: action.payload };
     case 'SET_FEATURED_PRODUCTS':
       return { ...state, featuredProducts: action.payload };
     case 'ADD_PRODUCT':
@@ -45,21 +51,37 @@ export const ProductProvider = ({ children }) => {
   const [state, dispatch] = useReducer(productReducer, {
     products: [],
     featuredProducts: [],
+    nextCursor: null,
     loading: false,
     error: null,
   });
 
+  // The unfiltered catalog shared by every page; filtered views (the Products
+  // page) fetch their own results so they never replace this list
   const fetchProducts = async () => {
     try {
       dispatch({ type: 'SET_LOADING', payload: true });
-      const response = await productsAPI.getAll();
-      const products = response.data;
+      const response = await productsAPI.getAll({ limit: PAGE_SIZE });
+      const { products, next_cursor } = response.data;
       
       dispatch({ type: 'SET_PRODUCTS', payload: products });
+      dispatch({ type: 'SET_NEXT_CURSOR', payload: next_cursor });
       
       // Set featured products (first 8 products for demo)
-      const featured = products.slice(0, 8);
-      dispatch({ type: 'SET_FEATURED_PRODUCTS', payload: featured });
+      dispatch({ type: 'SET_FEATURED_PRODUCTS', payload: products.slice(0, 8) });
+    } catch (error) {
+      dispatch({ type: 'SET_ERROR', payload: error.message });
+      toast.error('Failed to load products');
+    }
+  };
+
+  const loadMoreProducts = async () => {
+    if (!state.nextCursor) return;
+    try {
+      const response = await productsAPI.getAll({ limit: PAGE_SIZE, after: state.nextCursor });
+      const { products, next_cursor } = response.data;
+      dispatch({ type: 'APPEND_PRODUCTS', payload: products });
+      dispatch({ type: 'SET_NEXT_CURSOR', payload: next_cursor });
     } catch (error) {
       dispatch({ type: 'SET_ERROR', payload: error.message });
       toast.error('Failed to load products');
@@ -118,7 +140,9 @@ export const ProductProvider = ({ children }) => {
     featuredProducts: state.featuredProducts,
     loading: state.loading,
     error: state.error,
+    hasMore: Boolean(state.nextCursor),
     fetchProducts,
+    loadMoreProducts,
     createProduct,
     updateProduct,
     deleteProduct,
@@ -1,6 +1,7 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
 import { useProducts } from '../context/ProductContext';
 import { useAuth } from '../context/AuthContext';
+import { adminAPI } from '../services/api';
 import { useForm } from 'react-hook-form';
 import { 
   Package, 
@@ -16,39 +17,47 @@ import {
 } from 'lucide-react';
 
 const AdminDashboard = () => {
-  const { products, createProduct, updateProduct, deleteProduct } = useProducts();
+  const { products, hasMore, loadMoreProducts, createProduct, updateProduct, deleteProduct } = useProducts();
   const { user } = useAuth();
   const [activeTab, setActiveTab] = useState('overview');
   const [showProductForm, setShowProductForm] = useState(false);
   const [editingProduct, setEditingProduct] = useState(null);
 
+  const [summary, setSummary] = useState(null);
+
   const { register, handleSubmit, reset, formState: { errors } } = useForm();
 
+  useEffect(() => {
+    adminAPI.getStats()
+      .then((response) => setSummary(response.data))
+      .catch((error) => console.error('Failed to fetch stats:', error));
+  }, []);
+
   const stats = [
     {
       title: 'Total Products',
-      value: products.length,
+      value: summary ? summary.total_products.toLocaleString() : '—',
       icon: Package,
       color: 'bg-blue-500',
       change: '+12%'
     },
     {
       title: 'Total Orders',
-      value: '1,234',
+      value: summary ? summary.total_orders.toLocaleString() : '—',
       icon: ShoppingCart,
       color: 'bg-green-500',
       change: '+8%'
     },
     {
       title: 'Total Revenue',
-      value: '$45,678',
+      value: summary ? `$${summary.total_revenue.toLocaleString()}` : '—',
       icon: DollarSign,
       color: 'bg-purple-500',
       change: '+15%'
     },
     {
       title: 'Total Customers',
-      value: '8,901',
+      value: summary ? summary.total_customers.toLocaleString() : '—',
       icon: Users,
       color: 'bg-orange-500',
       change: '+5%'
@@ -281,6 +290,14 @@ const AdminDashboard = () => {
                 </tbody>
               </table>
             </div>
+
+            {hasMore && (
+              <div className="text-center mt-6">
+                <button onClick={loadMoreProducts} className="btn-secondary">
+                  Load more
+                </button>
+              </div>
+            )}
           </div>
         )}
 
@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useRef, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useCart } from '../context/CartContext';
 import { useAuth } from '../context/AuthContext';
@@ -20,6 +20,8 @@ const Checkout = () => {
   const [loading, setLoading] = useState(false);
   const [orderComplete, setOrderComplete] = useState(false);
   const [orderDetails, setOrderDetails] = useState(null);
+  // One key per checkout, so a retried submit cannot place a second order
+  const idempotencyKey = useRef(crypto.randomUUID());
 
   const { register, handleSubmit, formState: { errors } } = useForm({
     defaultValues: {
@@ -49,7 +51,7 @@ const Checkout = () => {
         shipping_address: `${data.address}, ${data.city}, ${data.state} ${data.zipCode}, ${data.country}`
       };
 
-      const response = await ordersAPI.create(orderData);
+      const response = await ordersAPI.create(orderData, idempotencyKey.current);
       setOrderDetails(response.data);
       setOrderComplete(true);
       clearCart();
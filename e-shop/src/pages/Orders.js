@@ -17,13 +17,15 @@ const Orders = () => {
   const { user } = useAuth();
   const navigate = useNavigate();
   const [orders, setOrders] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
   const [selectedOrder, setSelectedOrder] = useState(null);
 
   const fetchOrders = async () => {
     try {
       const response = await ordersAPI.getAll();
-      setOrders(response.data);
+      setOrders(response.data.orders);
+      setNextCursor(response.data.next_cursor);
     } catch (error) {
       console.error('Failed to fetch orders:', error);
     } finally {
@@ -31,6 +33,17 @@ const Orders = () => {
     }
   };
 
+  const loadMoreOrders = async () => {
+    if (!nextCursor) return;
+    try {
+      const response = await ordersAPI.getAll({ after: nextCursor });
+      setOrders((current) => [...current, ...response.data.orders]);
+      setNextCursor(response.data.next_cursor);
+    } catch (error) {
+      toast.error('Failed to load orders');
+    }
+  };
+
   useEffect(() => {
     fetchOrders();
   }, []);
@@ -72,9 +85,10 @@ const Orders = () => {
   const handleCancelOrder = async (orderId) => {
     if (window.confirm('Are you sure you want to cancel this order?')) {
       try {
-        await ordersAPI.cancel(orderId);
+        const response = await ordersAPI.cancel(orderId);
         toast.success('Order cancelled successfully');
-        fetchOrders(); // Refresh orders list
+        // Update in place, keeping older pages that were loaded
+        setOrders((current) => current.map((order) => (order.id === orderId ? response.data : order)));
       } catch (error) {
         const message = error.response?.data?.message || 'Failed to cancel order';
         toast.error(message);
@@ -266,6 +280,14 @@ const Orders = () => {
             ))}
           </div>
         )}
+
+        {nextCursor && (
+          <div className="text-center mt-8">
+            <button onClick={loadMoreOrders} className="btn-secondary">
+              Load more
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
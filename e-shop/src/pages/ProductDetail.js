@@ -1,8 +1,9 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
 import { useParams, Link, useNavigate } from 'react-router-dom';
 import { useProducts } from '../context/ProductContext';
 import { useCart } from '../context/CartContext';
 import { useAuth } from '../context/AuthContext';
+import { productsAPI } from '../services/api';
 import { 
   ShoppingCart, 
   Heart, 
@@ -24,7 +25,31 @@ const ProductDetail = () => {
   const [quantity, setQuantity] = useState(1);
   const [selectedImage, setSelectedImage] = useState(0);
 
-  const product = getProductById(id);
+  // The catalog list holds only the pages loaded so far; fetch anything else directly
+  const listed = getProductById(id);
+  const [fetched, setFetched] = useState(null);
+  const [loading, setLoading] = useState(!listed);
+
+  useEffect(() => {
+    if (listed) return;
+    let cancelled = false;
+    setLoading(true);
+    productsAPI.getById(id)
+      .then((response) => { if (!cancelled) setFetched(response.data); })
+      .catch(() => { if (!cancelled) setFetched(null); })
+      .finally(() => { if (!cancelled) setLoading(false); });
+    return () => { cancelled = true; };
+  }, [id, listed]);
+
+  const product = listed || (fetched && fetched.id === parseInt(id) ? fetched : null);
+
+  if (!product && loading) {
+    return (
+      <div className="min-h-screen flex items-center justify-center">
+        <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-primary-500"></div>
+      </div>
+    );
+  }
 
   if (!product) {
     return (
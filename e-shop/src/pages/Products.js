@@ -1,62 +1,74 @@
-import React, { useState, useMemo } from 'react';
+import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
-import { useProducts } from '../context/ProductContext';
+import { PAGE_SIZE } from '../context/ProductContext';
 import { useCart } from '../context/CartContext';
+import { productsAPI } from '../services/api';
 import { Search, Filter, Grid, List, Plus, ShoppingCart } from 'lucide-react';
+import { toast } from 'react-hot-toast';
+
+const SEARCH_DEBOUNCE_MS = 300;
 
 const Products = () => {
-  const { products, loading } = useProducts();
   const { addToCart } = useCart();
+  const [products, setProducts] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [query, setQuery] = useState({});
+  const [loading, setLoading] = useState(true);
   const [searchTerm, setSearchTerm] = useState('');
   const [selectedCategory, setSelectedCategory] = useState('all');
   const [sortBy, setSortBy] = useState('name');
   const [viewMode, setViewMode] = useState('grid');
+  const [categories, setCategories] = useState(['all']);
 
-  // Get unique categories
-  const categories = useMemo(() => {
-    const allCategories = products.map(product => product.category).filter(Boolean);
-    return ['all', ...new Set(allCategories)];
-  }, [products]);
+  useEffect(() => {
+    productsAPI.getCategories()
+      .then((response) => setCategories(['all', ...response.data]))
+      .catch(() => {});
+  }, []);
 
-  // Filter and sort products
-  const filteredProducts = useMemo(() => {
-    let filtered = products.filter(product =>
-      product.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      product.description.toLowerCase().includes(searchTerm.toLowerCase())
-    );
+  // Filtering and sorting happen on the server; only the matching page is fetched.
+  // Results stay local to this page so they never replace the shared catalog list.
+  useEffect(() => {
+    let cancelled = false;
+    const timer = setTimeout(() => {
+      const params = { sort: sortBy };
+      if (searchTerm.trim()) params.q = searchTerm.trim();
+      if (selectedCategory !== 'all') params.category = selectedCategory;
+      setLoading(true);
+      productsAPI.getAll({ ...params, limit: PAGE_SIZE })
+        .then((response) => {
+          if (cancelled) return;
+          setProducts(response.data.products);
+          setNextCursor(response.data.next_cursor);
+          setQuery(params);
+        })
+        .catch(() => { if (!cancelled) toast.error('Failed to load products'); })
+        .finally(() => { if (!cancelled) setLoading(false); });
+    }, SEARCH_DEBOUNCE_MS);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchTerm, selectedCategory, sortBy]);
 
-    if (selectedCategory !== 'all') {
-      filtered = filtered.filter(product => product.category === selectedCategory);
+  const loadMoreProducts = async () => {
+    if (!nextCursor) return;
+    try {
+      const response = await productsAPI.getAll({ ...query, limit: PAGE_SIZE, after: nextCursor });
+      setProducts((current) => [...current, ...response.data.products]);
+      setNextCursor(response.data.next_cursor);
+    } catch (error) {
+      toast.error('Failed to load products');
     }
+  };
 
-    // Sort products
-    filtered.sort((a, b) => {
-      switch (sortBy) {
-        case 'price-low':
-          return a.price - b.price;
-        case 'price-high':
-          return b.price - a.price;
-        case 'name':
-        default:
-          return a.name.localeCompare(b.name);
-      }
-    });
-
-    return filtered;
-  }, [products, searchTerm, selectedCategory, sortBy]);
+  const hasMore = Boolean(nextCursor);
+  const filteredProducts = products;
 
   const handleAddToCart = async (product) => {
     await addToCart(product.id, 1);
   };
 
-  if (loading) {
-    return (
-      <div className="min-h-screen flex items-center justify-center">
-        <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-primary-500"></div>
-      </div>
-    );
-  }
-
   return (
     <div className="min-h-screen bg-gray-50 py-8">
       <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
@@ -136,7 +148,11 @@ const Products = () => {
         </div>
 
         {/* Products Grid/List */}
-        {filteredProducts.length === 0 ? (
+        {loading ? (
+          <div className="flex items-center justify-center py-12">
+            <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-primary-500"></div>
+          </div>
+        ) : filteredProducts.length === 0 ? (
           <div className="text-center py-12">
             <div className="bg-gray-100 rounded-full w-16 h-16 flex items-center justify-center mx-auto mb-4">
               <Search className="h-8 w-8 text-gray-400" />
@@ -247,6 +263,14 @@ const Products = () => {
             ))}
           </div>
         )}
+
+        {hasMore && (
+          <div className="text-center mt-8">
+            <button onClick={loadMoreProducts} className="btn-secondary">
+              Load more
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
@@ -45,8 +45,9 @@ export const authAPI = {
 };
 
 export const productsAPI = {
-  getAll: () => api.get('/products'),
+  getAll: (params) => api.get('/products', { params }),
   getById: (id) => api.get(`/products/${id}`),
+  getCategories: () => api.get('/products/categories'),
   create: (productData) => api.post('/products', productData),
   update: (id, productData) => api.put(`/products/${id}`, productData),
   delete: (id) => api.delete(`/products/${id}`),
@@ -55,14 +56,21 @@ export const productsAPI = {
 export const cartAPI = {
   get: () => api.get('/cart'),
   addItem: (itemData) => api.post('/cart', itemData),
+  patch: (operations) => api.patch('/cart', { operations }),
   updateItem: (itemId, quantity) => api.put(`/cart/${itemId}`, { quantity }),
   removeItem: (itemId) => api.delete(`/cart/${itemId}`),
   clear: () => api.delete('/cart/clear'),
 };
 
 export const ordersAPI = {
-  getAll: () => api.get('/orders'),
+  getAll: (params) => api.get('/orders', { params }),
   getById: (id) => api.get(`/orders/${id}`),
-  create: (orderData) => api.post('/orders', orderData),
+  create: (orderData, idempotencyKey) => api.post('/orders', orderData, {
+    headers: idempotencyKey ? { 'Idempotency-Key': idempotencyKey } : {},
+  }),
   cancel: (id) => api.post(`/orders/${id}/cancel`),
+};
+
+export const adminAPI = {
+  getStats: (params) => api.get('/admin/stats', { params }),
 };
\ No newline at end of file